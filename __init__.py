@@ -1,5 +1,8 @@
 import bpy
 
+from time      import perf_counter
+
+_start = perf_counter()
 from .         import props
 from .         import preferences
 
@@ -18,6 +21,8 @@ modules = [
 
 classes = []
 
+import_times: dict[str, float] = {"props, preferences": perf_counter() - _start}
+
 def load_modules():
     addon_dir = Path(__file__).parent
 
@@ -30,7 +35,9 @@ def load_modules():
             module_name   = f"{__name__}.{'.'.join(relative_path.parts)}.{py_file.stem}"
                         
             try:
+                start  = perf_counter()
                 module = import_module(module_name)
+                import_times[module_name[len(__name__) + 1:]] = perf_counter() - start
                 modules.append(module)
                 if hasattr(module, 'CLASSES'):
                     classes.extend(module.CLASSES)
@@ -39,6 +46,13 @@ def load_modules():
                 print(f"Failed to import {module_name}: {e}")
 
 load_modules()
+
+def report_import_times() -> None:
+    """Module times include any submodules they import first."""
+    print("Yet Another Addon import times:")
+    for module_name, seconds in sorted(import_times.items(), key=lambda item: item[1], reverse=True):
+        print(f"    {seconds * 1000:8.2f} ms  {module_name}")
+    print(f"    {sum(import_times.values()) * 1000:8.2f} ms  Total")
     
 def register():
     for module in modules[:2]:
@@ -53,6 +67,9 @@ def register():
     preferences.register_menus()
     preferences.register_keymaps()
 
+    if preferences.get_prefs().profile_startup:
+        report_import_times()
+
     props.set_handlers()
     bpy.types.Scene.ya_addon_ver = (1, 0, 5)
     
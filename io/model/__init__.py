@@ -1,5 +1,31 @@
-from .handler        import SceneHandler
-from .exporter       import ModelExport
-from .importer       import ModelImport
-from .exp.scene      import get_mesh_ids
+from typing          import TYPE_CHECKING
+from importlib       import import_module
+
 from .com.exceptions import *
+
+if TYPE_CHECKING:
+    from .handler    import SceneHandler
+    from .exporter   import ModelExport
+    from .variants   import VariantCache
+    from .importer   import ModelImport
+    from .exp.scene  import get_mesh_ids
+    from .data       import get_neck_morphs
+
+
+# The exporter and importer stacks are only imported on first use, keeping them out of add-on startup.
+_LAZY_EXPORTS = {
+    "SceneHandler"   : ".handler",
+    "ModelExport"    : ".exporter",
+    "VariantCache"   : ".variants",
+    "ModelImport"    : ".importer",
+    "get_mesh_ids"   : ".exp.scene",
+    "get_neck_morphs": ".data",
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,6 +1,6 @@
 import numpy as np
 
-from numpy        import single, ubyte
+from numpy        import single, double, ubyte
 from numpy.typing import NDArray
 
 
@@ -31,12 +31,13 @@ def calc_tangents_with_bitangent(normals: NDArray, bitangents: NDArray, signs: N
     
     return normalise_vectors(tangents)
 
-def calc_tangents(positions: NDArray, uvs: NDArray, indices: NDArray, normals: NDArray) -> tuple[NDArray, NDArray]:
-    triangles     = indices.reshape(-1, 3)
-    num_triangles = len(triangles)
+def calc_tangents(positions: NDArray, uvs: NDArray, indices: NDArray, normals: NDArray) -> tuple[NDArray, NDArray, NDArray]:
+    """Returns orthonormalised vertex tangents, bitangents and bitangent signs. Assumes a triangulated mesh."""
+    triangles  = indices.reshape(-1, 3)
+    vert_count = len(positions)
     
-    tri_pos = positions[triangles] 
-    tri_uvs = uvs[triangles]       
+    tri_pos = positions[triangles].astype(double)
+    tri_uvs = uvs[triangles].astype(double)
     
     edge1_3d = tri_pos[:, 1] - tri_pos[:, 0] 
     edge2_3d = tri_pos[:, 2] - tri_pos[:, 0] 
@@ -46,45 +47,31 @@ def calc_tangents(positions: NDArray, uvs: NDArray, indices: NDArray, normals: N
     
     uv_determinants = edge1_uv[:, 0] * edge2_uv[:, 1] - edge2_uv[:, 0] * edge1_uv[:, 1]
     valid_mask      = np.abs(uv_determinants) > 1e-6
+    determinants    = np.where(valid_mask, uv_determinants, 1.0)[:, np.newaxis]
     
-    tri_tan   = np.zeros((num_triangles, 3), dtype=single)
-    tri_bitan = np.zeros((num_triangles, 3), dtype=single)
+    tri_tan   = ((edge2_uv[:, 1:2] * edge1_3d) - (edge1_uv[:, 1:2] * edge2_3d)) / determinants
+    tri_bitan = ((edge1_uv[:, 0:1] * edge2_3d) - (edge2_uv[:, 0:1] * edge1_3d)) / determinants
     
-    if np.any(valid_mask):
-        valid_determinants = uv_determinants[valid_mask]
-        
-        tri_tan[valid_mask] = (
-            (edge2_uv[valid_mask, 1:2] * edge1_3d[valid_mask]) - (edge1_uv[valid_mask, 1:2] * edge2_3d[valid_mask])
-        ) / valid_determinants[:, np.newaxis]
-        
-        tri_bitan[valid_mask] = (
-            (edge1_uv[valid_mask, 0:1] * edge2_3d[valid_mask]) - (edge2_uv[valid_mask, 0:1] * edge1_3d[valid_mask])
-        ) / valid_determinants[:, np.newaxis]
+    tri_tan[~valid_mask]   = (1.0, 0.0, 0.0)
+    tri_bitan[~valid_mask] = (0.0, 1.0, 0.0)
     
-    if np.any(~valid_mask):
-        tri_tan[~valid_mask]   = np.array([1.0, 0.0, 0.0])
-        tri_bitan[~valid_mask] = np.array([0.0, 1.0, 0.0])
-    
-    vert_tan    = np.zeros_like(positions)
-    vert_bitan  = np.zeros_like(positions)
-    vert_counts = np.zeros(len(positions))
-    
-    for i in range(3):  
-        np.add.at(vert_tan, triangles[:, i], tri_tan)
-        np.add.at(vert_bitan, triangles[:, i], tri_bitan)
-        np.add.at(vert_counts, triangles[:, i], 1)
-    
-    vert_counts = np.maximum(vert_counts, 1)
-    tangents    = vert_tan / vert_counts[:, np.newaxis]
-    bitangents  = vert_bitan / vert_counts[:, np.newaxis]
-    
-    tangents   = normalise_vectors(tangents)
-    bitangents = normalise_vectors(bitangents)
+    # Each triangle contributes to all three of its corners. 
+    # bincount sums the contributions per vertex without the overhead of np.add.at.
+    corners    = triangles.ravel()
+    vert_tan   = np.zeros((vert_count, 3), dtype=double)
+    vert_bitan = np.zeros((vert_count, 3), dtype=double)
+    for axis in range(3):
+        vert_tan[:, axis]   = np.bincount(corners, weights=np.repeat(tri_tan[:, axis], 3), minlength=vert_count)
+        vert_bitan[:, axis] = np.bincount(corners, weights=np.repeat(tri_bitan[:, axis], 3), minlength=vert_count)
     
-    signs = calc_sign(vert_tan, vert_bitan, normals)
-    bitangents = vert_bitan * signs[:, np.newaxis]
+    # Gram-Schmidt orthogonalisation against the vertex normal.
+    normals    = normals.astype(double)
+    vert_tan  -= normals * np.sum(normals * vert_tan, axis=1, keepdims=True)
+    tangents   = normalise_vectors(vert_tan)
+    signs      = calc_sign(tangents, vert_bitan, normals)
+    bitangents = np.cross(normals, tangents) * signs[:, np.newaxis]
     
-    return tangents, bitangents
+    return tangents.astype(single), bitangents.astype(single), signs.astype(single)
 
 def calc_sign(tangents: NDArray, bitangents: NDArray, normals: NDArray) -> NDArray:
     dot_product = np.sum(tangents * np.cross(normals, bitangents), axis=1)
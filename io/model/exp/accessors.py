@@ -5,7 +5,7 @@ from bpy.types       import Object
 from numpy.typing    import NDArray
             
 from ..com.space     import blend_to_xiv_space, world_to_tangent_space
-from ..com.helpers   import average_vert_normals, calc_tangents_with_bitangent, vector_to_bytes, quantise_flow, normalise_vectors
+from ..com.helpers   import average_vert_normals, calc_tangents, calc_tangents_with_bitangent, vector_to_bytes, quantise_flow, normalise_vectors
 
 from ....xivpy.model import XIV_COL, XIV_UV
 
@@ -101,6 +101,27 @@ def get_bitangents(obj: Object, indices: NDArray, loop_count: NDArray, uv_layer:
 
     return np.c_[vert_tan, vert_bisign]
 
+def get_tangent_uvs(obj: Object, indices: NDArray, vert_count: int, loop_count: int, uv_layer: str) -> NDArray:
+    """UVs used for tangent calculations. V is not flipped so handedness matches Blender's tangents."""
+    loop_uvs = np.zeros(loop_count * 2, single)
+    obj.data.uv_layers[uv_layer].uv.foreach_get("vector", loop_uvs)
+
+    return _loop_to_vert(loop_uvs.reshape(-1, 2), indices, vert_count, 2)
+
+def calc_bitangents(positions: NDArray, uvs: NDArray, indices: NDArray, normals: NDArray) -> NDArray:
+    """Numpy alternative to get_bitangents. Does not touch Blender data, so it's safe to run in a worker thread."""
+    tangents, bitangents, signs = calc_tangents(positions, uvs, indices, normals)
+
+    return np.c_[bitangents, signs]
+
+def tangent_deviation(reference: NDArray, bitangents: NDArray) -> tuple[float, float, int]:
+    """Returns the max and mean angle in degrees between two bitangent arrays, as well as the amount of mismatched signs."""
+    dots   = np.sum(normalise_vectors(reference[:, :3]) * normalise_vectors(bitangents[:, :3]), axis=1)
+    angles = np.degrees(np.arccos(np.clip(dots, -1.0, 1.0)))
+    flips  = np.sum(reference[:, 3] != bitangents[:, 3])
+
+    return float(angles.max()), float(angles.mean()), int(flips)
+
 def get_weights(obj: Object, vert_count: int, group_count: int) -> NDArray:
     weight_matrix = np.zeros((vert_count, group_count), dtype=np.float32)
     for vertex_idx, vertex in enumerate(obj.data.vertices):
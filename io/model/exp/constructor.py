@@ -94,9 +94,10 @@ def decl_from_blend_mesh(submeshes: list[Object], export_flow=False) -> VertexDe
     return decl
 
 class CreateLOD:
-    def __init__(self, model: XIVModel, lod_level: int, face_data: bool, logger: YetAnotherLogger = None):
+    def __init__(self, model: XIVModel, lod_level: int, face_data: bool, tangents: str='BLENDER', logger: YetAnotherLogger = None):
         self.model     = model
         self.logger    = logger
+        self.tangents  = tangents
         self.lod_level = lod_level
         self.face_data = face_data
 
@@ -112,8 +113,8 @@ class CreateLOD:
         self.export_stats: dict[str, list[str]]                 = defaultdict(list)
 
     @classmethod
-    def construct(cls, model: XIVModel, lod_level: int, active_lod: Lod, face_data: bool, sorted_meshes: list[list[Object]], logger: YetAnotherLogger = None ) -> 'CreateLOD':
-        lod = cls(model, lod_level, face_data, logger=logger)
+    def construct(cls, model: XIVModel, lod_level: int, active_lod: Lod, face_data: bool, sorted_meshes: list[list[Object]], tangents: str='BLENDER', logger: YetAnotherLogger = None ) -> 'CreateLOD':
+        lod = cls(model, lod_level, face_data, tangents=tangents, logger=logger)
         lod._construct(active_lod, sorted_meshes)
         return lod
 
@@ -342,7 +343,14 @@ class CreateLOD:
             return bitmask
         
         submesh = Submesh()
-        indices, submesh_streams, shapes = get_submesh_streams(obj, vert_decl, mesh_flow)
+        tangent_stats = self.export_stats[obj.name] if self.tangents == 'VALIDATE' else None
+        indices, submesh_streams, shapes = get_submesh_streams(
+                                                    obj, 
+                                                    vert_decl, 
+                                                    mesh_flow, 
+                                                    tangents=self.tangents, 
+                                                    stats=tangent_stats
+                                                )
         submesh.attribute_idx_mask       = attribute_bitmask(obj)
 
         if obj.vertex_groups:
@@ -1,7 +1,8 @@
 import numpy as np
 
-from bpy.types       import Object
-from numpy.typing    import NDArray
+from bpy.types          import Object
+from numpy.typing       import NDArray
+from concurrent.futures import ThreadPoolExecutor
  
 from .accessors      import *
 from ..com.schema    import get_array_type
@@ -9,20 +10,39 @@ from ..com.helpers   import vector_to_bytes, byte_sign
 from ....xivpy.model import VertexDeclaration, VertexUsage, Mesh as XIVMesh
 
 
-def get_submesh_streams(obj: Object, vert_decl: VertexDeclaration, mesh_flow: bool) -> tuple[NDArray, dict[int, NDArray], dict[str, NDArray]]:
+def get_submesh_streams(obj: Object, vert_decl: VertexDeclaration, mesh_flow: bool, tangents: str='BLENDER', stats: list[str]=None) -> tuple[NDArray, dict[int, NDArray], dict[str, NDArray]]:
         vert_count = len(obj.data.vertices)
         loop_count = len(obj.data.loops)
         uv_count   = vert_decl.usage_count(VertexUsage.UV)
         col_count  = vert_decl.usage_count(VertexUsage.COLOUR)
+        uv_layer   = obj.data.uv_layers[0].name
 
         indices = np.zeros(loop_count, np.uint16)
         obj.data.loops.foreach_get("vertex_index", indices)
 
-        pos, nor   = get_space_data(obj, indices, vert_count, loop_count)
-        shapes     = get_shape_co(obj, vert_count)
-        uv_arrays  = get_uvs(obj, indices, vert_count, loop_count, uv_count)
-        col_arrays = get_col_attributes(obj, indices, vert_count, loop_count, col_count)
-        bitangents = get_bitangents(obj, indices, loop_count, obj.data.uv_layers[0].name)
+        pos, nor = get_space_data(obj, indices, vert_count, loop_count)
+
+        # The numpy tangents only need the arrays we've already read, 
+        # so they're calculated in the background while we read the remaining Blender data.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            fast_tangents = None
+            if tangents != 'BLENDER':
+                tangent_uvs   = get_tangent_uvs(obj, indices, vert_count, loop_count, uv_layer)
+                fast_tangents = executor.submit(calc_bitangents, pos, tangent_uvs, indices, nor)
+
+            shapes     = get_shape_co(obj, vert_count)
+            uv_arrays  = get_uvs(obj, indices, vert_count, loop_count, uv_count)
+            col_arrays = get_col_attributes(obj, indices, vert_count, loop_count, col_count)
+
+            if tangents == 'NUMPY':
+                bitangents = fast_tangents.result()
+            else:
+                bitangents = get_bitangents(obj, indices, loop_count, uv_layer)
+
+            if tangents == 'VALIDATE':
+                max_angle, mean_angle, flips = tangent_deviation(bitangents, fast_tangents.result())
+                if stats is not None:
+                    stats.append(f"Tangent deviation: {max_angle:.2f}° max, {mean_angle:.2f}° mean, {flips} flipped signs.")
 
         streams = create_stream_arrays(vert_count, vert_decl)
         
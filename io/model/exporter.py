@@ -21,9 +21,10 @@ def get_lod_range(lod_level: int) -> float:
 
 class ModelExport:
     
-    def __init__(self, logger: YetAnotherLogger=None, **model_flags):
+    def __init__(self, logger: YetAnotherLogger=None, tangents: str='BLENDER', **model_flags):
         self.model             = XIVModel()
         self.logger            = logger
+        self.tangents          = tangents
 
         self.model_flags : dict[str, bool]      = model_flags
         self.export_stats: dict[str, list[str]] = defaultdict(list)
@@ -36,10 +37,11 @@ class ModelExport:
                 export_lods: bool,
                 neck_morphs: list[tuple[list[float], list[float]]], 
                 logger     : YetAnotherLogger=None, 
+                tangents   : str='BLENDER',
                 **model_flags
             ) -> dict[str, list[str]]:
         
-        exporter = cls(logger=logger, **model_flags)
+        exporter = cls(logger=logger, tangents=tangents, **model_flags)
         return exporter._create_model(export_obj, file_path, export_lods, neck_morphs)
 
     def _create_model(
@@ -72,6 +74,7 @@ class ModelExport:
                                 active_lod, 
                                 face_data, 
                                 sorted_meshes,
+                                tangents=self.tangents,
                                 logger=self.logger
                             )
             
@@ -11,23 +11,27 @@ from collections.abc       import Iterable
    
 from ..logging             import YetAnotherLogger
 from ...props              import get_window_props, get_devkit_props, get_studio_props, get_xiv_meshes  
+from .variants             import add_source_index
 from .com.space            import lin_to_srgb       
-from ...mesh.shapes        import get_shape_mix
+from ...mesh.shapes        import get_shape_mixes
 from .com.exceptions       import XIVMeshParentError
-from ...mesh.weights       import remove_vertex_groups
+from ...mesh.weights       import remove_vertex_groups, remove_groups
 from ...mesh.objects       import visible_meshobj, safe_object_delete, copy_mesh_object, quick_copy
-from ...mesh.face_order    import get_original_faces, sequential_faces
+from ...mesh.face_order    import add_face_index, remove_face_index, sequential_faces
 from ...xivpy.model.vertex import XIV_COL
 
 
-def create_backfaces(obj:Object) -> None:
-    """Assumes the mesh is triangulated to get the faces from _get_backfaces."""
+def create_backfaces(obj:Object) -> NDArray | None:
+    """
+    Assumes the mesh is triangulated to get the faces from _get_backfaces.
+    Returns the source vertex of every vertex in the new mesh, duplicates point to the vertex they were created from.
+    """
     
     if "BACKFACES" not in obj.vertex_groups:
-        return
+        return None
     
     mesh = obj.data
-    old_poly_count = len(mesh.polygons) 
+    old_loop_count = len(mesh.loops) 
 
     bm = bmesh.new()
     bm.from_mesh(mesh)
@@ -37,61 +41,53 @@ def create_backfaces(obj:Object) -> None:
 
     bf_idx    = obj.vertex_groups["BACKFACES"].index
     backfaces = _get_backfaces(bm, bf_idx)
+    old_verts = len(bm.verts)
     
-    dupe_faces = [
-        geo for geo in 
-        bmesh.ops.duplicate(bm, geom=backfaces[:])["geom"] 
-        if isinstance(geo, bmesh.types.BMFace)
-        ]
+    duplicate  = bmesh.ops.duplicate(bm, geom=backfaces[:])
+    dupe_faces = [geo for geo in duplicate["geom"] if isinstance(geo, bmesh.types.BMFace)]
 
     bmesh.ops.reverse_faces(bm, faces=dupe_faces)
+    bm.verts.index_update()
+
+    source_verts = np.arange(len(bm.verts), dtype=np.int32)
+    for source, new in duplicate["vert_map"].items():
+        if source.index < old_verts <= new.index:
+            source_verts[new.index] = source.index
 
     bm.to_mesh(mesh)
     bm.free()
 
-    normals = []
-    for face_idx, face in enumerate(mesh.polygons):
-        if face_idx >= old_poly_count:
-            normals.extend([(0, 0, 0)] * face.loop_total)
-        else:
-            for i in range(face.loop_total):
-                loop_idx = face.loop_start + i
-                normals.append(tuple(mesh.loops[loop_idx].normal))
+    # The original faces keep their current normals, zeroed normals fall back to the auto normal of the new faces.
+    normals = np.zeros(len(mesh.loops) * 3, dtype=np.float32)
+    mesh.loops.foreach_get("normal", normals)
+    normals = normals.reshape(-1, 3)
+    normals[old_loop_count:] = 0
 
     mesh.normals_split_custom_set(normals)
 
+    return source_verts
+
 def backfaces_with_shapes(obj: Object) -> None:
+    """Duplicates the backfaces once and extends every shape key through the returned vertex map."""
     key_blocks = obj.data.shape_keys.key_blocks
+    verts      = len(obj.data.vertices)
 
-    temp_obj = {}
-    verts    = len(obj.data.vertices)
-    shape_co = np.zeros(verts * 3, dtype=np.float32)
+    shape_co: dict[str, NDArray] = {}
     for key in key_blocks[1:]:
-        temp_copy = quick_copy(obj)
-        
-        key.data.foreach_get("co", shape_co)
-
-        temp_copy.shape_key_clear()
-        temp_copy.data.vertices.foreach_set("co", shape_co)
-        create_backfaces(temp_copy)
-
-        temp_obj[key.name] = temp_copy
+        key_co = np.zeros(verts * 3, dtype=np.float32)
+        key.data.foreach_get("co", key_co)
+        shape_co[key.name] = key_co.reshape(-1, 3)
     
     obj.shape_key_clear()
-    create_backfaces(obj)
+    source_verts = create_backfaces(obj)
     obj.shape_key_add(name="Basis")
 
-    verts = len(obj.data.vertices)
-    shape_co = np.zeros(verts * 3, dtype=np.float32)
-
-    for key_name, copy in temp_obj.items():
-        copy: Object
-        copy.data.vertices.foreach_get("co", shape_co)
+    if source_verts is None:
+        source_verts = np.arange(verts)
 
+    for key_name, key_co in shape_co.items():
         new_shape = obj.shape_key_add(name=key_name)
-        new_shape.data.foreach_set("co", shape_co)
-
-        safe_object_delete(copy)
+        new_shape.data.foreach_set("co", key_co[source_verts].ravel())
 
 def _get_backfaces(bm: BMesh, bf_idx: int) -> list[BMFace]:
     deform_layer = bm.verts.layers.deform.active
@@ -110,36 +106,47 @@ def _get_backfaces(bm: BMesh, bf_idx: int) -> list[BMFace]:
     
     return backfaces
 
+# Maps stored bytes to the corrected float colour. RGB is the stored value as is, 
+# alpha keeps the sRGB transfer the previous float round trip applied to it.
+_BYTE_LUT        = np.empty((256, 4), dtype=np.float32)
+_BYTE_LUT[:, :3] = (np.arange(256, dtype=np.float32) / 255)[:, None]
+_BYTE_LUT[:, 3]  = lin_to_srgb(np.arange(256, dtype=np.float32) / 255)
+
+def _needs_correction(layer) -> bool:
+    return layer.name.lower().startswith(XIV_COL) and layer.data_type == 'BYTE_COLOR'
+
 def colour_layer_correction(obj: Object) -> None:
-    '''This function corrects linear colour data that's been wrongly stored as sRGB during FBX import.'''
-    verts  = len(obj.data.vertices)
-    loops  = len(obj.data.loops)
-    layers = [layer.name for layer in obj.data.color_attributes]
+    '''
+    This function corrects linear colour data that's been wrongly stored as sRGB during FBX import.
+    Corrected layers become float layers. Blender lists colour layers by domain, then type, then creation order,
+    so only the corrected layers and the float layers of the same domain are recreated to keep their relative order.
+    Byte layers that don't need correcting, and layers on other domains, are left as they are.
+    '''
+    colours  = obj.data.color_attributes
+    domains  = {layer.domain for layer in colours if _needs_correction(layer)}
+    recreate = [
+        layer.name for layer in colours 
+        if _needs_correction(layer) or (layer.domain in domains and layer.data_type == 'FLOAT_COLOR')
+        ]
     
-    layer_data: list[tuple[bool, str, str, str, NDArray]] = []
-    for name in layers:
-        layer   = obj.data.color_attributes[name]
-        domain  = layer.domain
-        convert = name.lower().startswith(XIV_COL) and layer.data_type == 'BYTE_COLOR'
-        data    = 'FLOAT_COLOR' if convert else layer.data_type
-
-        count = verts if domain == 'POINT' else loops
-        rgba = np.ones(count * 4, dtype=np.float32)
-
-        # When we access the data here, Blender converts what it thinks is sRGB to Linear colours.
-        # Problem is the data is already Linear.
-        layer.data.foreach_get("color", rgba)
-        obj.data.color_attributes.remove(layer)
-        layer_data.append((convert, name, domain, data, rgba))
-        
-    for convert, name, domain, data, rgba in layer_data:
-        layer = obj.data.color_attributes.new(name, domain=domain, type=data)
-        
-        # Here we apply the opposite conversion to restore the linear data. 
-        # Due to the gamma curve we won't get the exact values back, but an approximation.
-        if convert:
-            rgba = lin_to_srgb(rgba)
+    layer_data: list[tuple[str, str, NDArray]] = []
+    for name in recreate:
+        layer = colours[name]
+        rgba  = np.zeros(len(layer.data) * 4, dtype=np.float32)
+
+        if _needs_correction(layer):
+            # color_srgb reads byte colours without Blender's sRGB to linear conversion, so we get the stored bytes.
+            layer.data.foreach_get("color_srgb", rgba)
+            stored = np.rint(rgba.reshape(-1, 4) * 255).astype(np.uint8)
+            rgba   = _BYTE_LUT[stored, np.arange(4)].ravel()
+        else:
+            layer.data.foreach_get("color", rgba)
 
+        layer_data.append((name, layer.domain, rgba))
+        colours.remove(layer)
+        
+    for name, domain, rgba in layer_data:
+        layer = colours.new(name, domain=domain, type='FLOAT_COLOR')
         layer.data.foreach_set("color", rgba)
 
 def set_mesh_props(dupes: list[Object]) -> None:
@@ -176,8 +183,10 @@ class SceneHandler:
         self.xiv_mdl   : bool            = props.file.model_format == 'MDL'
         self.is_tris   : bool            = props.check_tris or self.xiv_mdl
         self.backfaces : bool            = (props.create_backfaces and self.is_tris)
+        self.light_copy: bool            = props.light_copies and self.xiv_mdl
         self.yas_vag   : bool            = True
         self.remove_yas: str             = props.file.io.remove_yas
+        self.quant_step: float           = 1 / props.file.io.weight_grid if props.file.io.quantise_weights and self.xiv_mdl else 0
         self.batch     : bool            = batch
         self.torso     : bool            = self.batch and "Chest" in props.file.io.export_body_slot
         self.delete    : list[Object]    = []
@@ -192,6 +201,10 @@ class SceneHandler:
         self.logger     : YetAnotherLogger = logger
         self.meshes     : dict[Object, dict[str, list | bool]] = {}
         self.export_objs: list[Object] = []                       
+
+        # Used by batch exports to map processed meshes back to their source.
+        self.source_index: bool                 = False
+        self.sources     : dict[Object, Object] = {}
     
     def prepare_scene(self) -> None:
         if self.logger:
@@ -300,10 +313,14 @@ class SceneHandler:
             if obj in fixed_transp:
                 dupe = fixed_transp[obj]
             else:
-                dupe = copy_mesh_object(obj, self.depsgraph)
+                dupe = copy_mesh_object(obj, self.depsgraph, lightweight=self.light_copy)
 
                 self.rename_object(dupe, stats["old_name"])
 
+            self.sources[dupe] = obj
+            if self.source_index and len(dupe.data.vertices) == len(obj.data.vertices):
+                add_source_index(dupe)
+
             if stats["shape"]:
                 shape_keys.append((dupe, obj, stats["shape"]))
             
@@ -335,22 +352,31 @@ class SceneHandler:
             self.logger.log("Fixing face order...", 2)
 
         fixed_transp = {}
-        to_process: list[tuple[Object, list]] = []
+        to_process: list[Object] = []
+
+        # The face index has to be evaluated with the source's modifiers, so it's removed again after copying.
         for obj in transparency:
-            if self.logger:
-                self.logger.last_item = f"{obj.name}"
-            
-            original_faces = get_original_faces(obj)
+            add_face_index(obj.data)
+        self.depsgraph.update()
+        
+        try:
+            for obj in transparency:
+                if self.logger:
+                    self.logger.last_item = f"{obj.name}"
 
-            dupe = copy_mesh_object(obj, self.depsgraph)
+                dupe = copy_mesh_object(obj, self.depsgraph, lightweight=self.light_copy)
 
-            self.rename_object(dupe, self.meshes[obj]["old_name"])
+                self.rename_object(dupe, self.meshes[obj]["old_name"])
 
-            fixed_transp[obj] = dupe
-            to_process.append((dupe, original_faces))
+                fixed_transp[obj] = dupe
+                to_process.append(dupe)
+
+        finally:
+            for obj in transparency:
+                remove_face_index(obj.data)
         
         tri_graph = bpy.context.evaluated_depsgraph_get()
-        for dupe, original_faces in to_process:
+        for dupe in to_process:
             eval_obj  = dupe.evaluated_get(tri_graph)
             dupe.data = bpy.data.meshes.new_from_object(
                             eval_obj, 
@@ -358,7 +384,7 @@ class SceneHandler:
                             depsgraph=tri_graph
                             )
             
-            sequential_faces(dupe, original_faces)
+            sequential_faces(dupe)
         
         return fixed_transp
     
@@ -379,24 +405,22 @@ class SceneHandler:
                 vert_mismatches.append((dupe, original, keys))
                 continue
 
+            mix_coords, key_mixes = get_shape_mixes(original, [key.name for key in keys])
             for key in keys:
                 if self.logger:
                     self.logger.last_item = f"{dupe.name}: Shape {key.name}"
-                self._keep_shapes(original, dupe, key.name)
+                self._keep_shapes(dupe, key.name, key_mixes.get(key.name, mix_coords))
 
         if vert_mismatches:
             if self.logger:
                 self.logger.log("-> Accounting for vert mismatch...", 2)
             self._shape_vert_mismatch(vert_mismatches)
 
-    def _keep_shapes(self, original: Object, dupe: Object, key_name: str) -> None:
+    def _keep_shapes(self, dupe: Object, key_name: str, coords: NDArray) -> None:
         if not dupe.data.shape_keys:
             dupe.shape_key_add(name="Basis")
 
         new_shape = dupe.shape_key_add(name=key_name)
-        
-        coords = get_shape_mix(original, key_name)
-      
         new_shape.data.foreach_set("co", coords)
 
     def _shape_vert_mismatch(self, vert_mismatches: list[tuple[Object, Object, list[ShapeKey]]]) -> None:
@@ -468,13 +492,17 @@ class SceneHandler:
         if self.logger:
             self.logger.log("Cleaning vertex groups...", 2)
 
-        prefix = self._get_yas_filter()
+        # Quantising is opt in for MDL exports, merged weights below half a step are dropped.
+        prefix    = self._get_yas_filter()
+        deviation = 0.0
         for dupe in dupes:
-            for v_group in dupe.vertex_groups:
-                if not dupe.parent.data.bones.get(v_group.name):
-                    dupe.vertex_groups.remove(v_group)
+            bones = dupe.parent.data.bones
+            remove_groups(dupe, [v_group for v_group in dupe.vertex_groups if not bones.get(v_group.name)])
             if prefix:
-                remove_vertex_groups(dupe, dupe.parent, prefix)
+                deviation = max(deviation, remove_vertex_groups(dupe, dupe.parent, prefix, step=self.quant_step))
+
+        if self.logger and deviation:
+            self.logger.log(f"-> Quantised merged weights, max deviation: {deviation:.5f}", 2)
 
     def _get_yas_filter(self) -> tuple[str]:
         excluded_groups = set()
@@ -0,0 +1,170 @@
+import bpy
+import numpy as np
+
+from typing          import TYPE_CHECKING
+from numpy           import intc
+from bpy.types       import Object
+
+from ..logging       import YetAnotherLogger
+from ...mesh.shapes  import get_shape_mix, get_shape_mixes
+from ...mesh.objects import safe_object_delete
+
+if TYPE_CHECKING:
+    from .handler    import SceneHandler
+
+
+SOURCE_INDEX     = "yas_source_index"
+STATIC_MODIFIERS = {'ARMATURE', 'TRIANGULATE'}
+
+def add_source_index(obj: Object) -> None:
+    """Stores the original vertex index, it survives backfaces, seam splits and loose vertex removal."""
+    vert_count = len(obj.data.vertices)
+    attribute  = obj.data.attributes.new(SOURCE_INDEX, type='INT', domain='POINT')
+    attribute.data.foreach_set("value", np.arange(vert_count, dtype=intc))
+
+def get_source_index(obj: Object) -> np.ndarray:
+    index = np.zeros(len(obj.data.vertices), dtype=intc)
+    obj.data.attributes[SOURCE_INDEX].data.foreach_get("value", index)
+    return index
+
+def source_positions(obj: Object) -> np.ndarray:
+    if obj.data.shape_keys:
+        return get_shape_mix(obj).reshape(-1, 3)
+    
+    positions = np.zeros(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", positions)
+    return positions.reshape(-1, 3)
+
+def variant_signature(handler: 'SceneHandler') -> tuple:
+    """Everything that decides the topology, weights and kept shape keys of the processed meshes."""
+    objects = []
+    for obj, stats in handler.meshes.items():
+        modifiers = tuple((modifier.name, modifier.type) for modifier in obj.modifiers if modifier.show_viewport)
+        objects.append((
+            stats["old_name"],
+            tuple(key.name for key in stats["shape"]),
+            bool(stats["transparency"]),
+            bool(stats["backfaces"]),
+            modifiers,
+            ))
+
+    return (handler.rue, handler.buff, handler.torso, handler.yas_vag, tuple(objects))
+
+
+class VariantCache:
+    """
+    Keeps the processed export meshes of a batch alive between files.
+    Items that only change shape key values reuse the cached topology, weights, UVs and colours,
+    the positions and kept shape keys are recalculated from the shape mix of the source meshes.
+    Anything else, or source meshes that are deformed by more than their shape keys, triggers a full rebuild.
+    """
+
+    def __init__(self, logger: YetAnotherLogger=None):
+        self.logger   : YetAnotherLogger = logger
+        self.signature: tuple | None     = None
+        self.names    : dict[Object, str] = {}
+        self.targets  : list[tuple[Object, Object, list[str], np.ndarray]] = []
+
+    def get_export_objs(self, handler: 'SceneHandler') -> list[Object]:
+        """Expects a handler that has run prepare_scene. Returns the meshes to pass to the MDL exporter."""
+        signature = variant_signature(handler)
+        if self.signature is not None and signature == self.signature:
+            if self.logger:
+                self.logger.log("Reusing processed meshes...", 2)
+            self._update(handler)
+            return list(self.names)
+
+        self.clear()
+        handler.source_index = True
+        handler.process_scene()
+        self._capture(handler, signature)
+
+        return handler.export_objs
+
+    def park(self) -> None:
+        """Hides the cached meshes so the source meshes can be restored for the next item."""
+        for dupe in self.names:
+            dupe.hide_set(state=True)
+            dupe.name = "yas_variant"
+
+    def clear(self) -> None:
+        for dupe in self.names:
+            safe_object_delete(dupe)
+
+        self.signature = None
+        self.names     = {}
+        self.targets   = []
+
+    def _capture(self, handler: 'SceneHandler', signature: tuple) -> None:
+        targets = []
+        for dupe in handler.export_objs:
+            source = handler.sources[dupe]
+            if not self._is_static(source, dupe):
+                return
+            keys = [key.name for key in dupe.data.shape_keys.key_blocks[1:]] if dupe.data.shape_keys else []
+            # The exporter bakes this into the dupe before writing it, reused items have to reproduce it.
+            targets.append((source, dupe, keys, np.array(dupe.matrix_world, dtype=np.float64)))
+
+        # The cache takes ownership of the meshes, the handler would otherwise delete them on restore.
+        handler.delete = [obj for obj in handler.delete if obj not in handler.sources]
+        self.signature = signature
+        self.names     = {dupe: dupe.name for dupe in handler.export_objs}
+        self.targets   = targets
+
+    def _is_static(self, source: Object, dupe: Object) -> bool:
+        if SOURCE_INDEX not in dupe.data.attributes or dupe.data.has_custom_normals:
+            return False
+        
+        # The shape mix only reproduces relative keys blended normally.
+        shape_keys = source.data.shape_keys
+        if shape_keys and (not shape_keys.use_relative or source.show_only_shape_key):
+            return False
+        if any(modifier.type not in STATIC_MODIFIERS for modifier in source.modifiers if modifier.show_viewport):
+            return False
+
+        # Catches posed armatures and anything else that moves vertices outside of the shape keys.
+        index   = get_source_index(dupe)
+        dupe_co = np.zeros(len(dupe.data.vertices) * 3, dtype=np.float32)
+        dupe.data.vertices.foreach_get("co", dupe_co)
+
+        return np.allclose(dupe_co.reshape(-1, 3), source_positions(source)[index], atol=1e-5)
+
+    def _update(self, handler: 'SceneHandler') -> None:
+        for source, dupe, keys, world_matrix in self.targets:
+            if self.logger:
+                self.logger.last_item = f"{dupe.name}"
+
+            # The exporter baked the captured world matrix into the dupe on the first item and reset its basis.
+            # Positions are written so that its current world matrix lands them on the captured transform again.
+            transform = np.linalg.inv(np.array(dupe.matrix_world, dtype=np.float64)) @ world_matrix
+            index     = get_source_index(dupe)
+
+            def to_dupe(coords: np.ndarray) -> np.ndarray:
+                coords = coords.reshape(-1, 3)[index]
+                if not np.allclose(transform, np.identity(4)):
+                    coords = coords @ transform[:3, :3].T + transform[:3, 3]
+                return coords.astype(np.float32).ravel()
+
+            if source.data.shape_keys:
+                mix_co, key_mixes = get_shape_mixes(source, keys)
+            else:
+                mix_co, key_mixes = source_positions(source), {}
+
+            dupe_co = to_dupe(mix_co)
+            dupe.data.vertices.foreach_set("co", dupe_co)
+            if dupe.data.shape_keys:
+                key_blocks = dupe.data.shape_keys.key_blocks
+                key_blocks[0].data.foreach_set("co", dupe_co)
+                for key_name in keys:
+                    key_blocks[key_name].data.foreach_set("co", to_dupe(key_mixes.get(key_name, mix_co)))
+
+            dupe.data.update()
+
+        for obj in handler.meshes:
+            obj.hide_set(state=True)
+
+        for dupe, name in self.names.items():
+            dupe.name = name
+            dupe.hide_set(state=False)
+
+        bpy.context.view_layer.update()
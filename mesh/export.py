@@ -4,13 +4,11 @@ from pathlib         import Path
 from bpy.types       import Context, UILayout
    
 from .objects        import visible_meshobj
-from ..io.model      import ModelExport, SceneHandler
+from ..io.model      import VariantCache
 from ..io.logging    import YetAnotherLogger
-from ..io.model.data import get_neck_morphs
 from ..props.getters import get_studio_props
 
 
-
 _export_stats: dict[str, list[str]] = {}
 
 def check_triangulation() -> list[str]:
@@ -45,9 +43,9 @@ def get_export_path(directory: Path, file_name: str, subfolder: bool, body_slot:
 
     return export_path
 
-def export_result(file_path: Path, file_format: str, logger: YetAnotherLogger=None, batch=False) -> None:
+def export_result(file_path: Path, file_format: str, logger: YetAnotherLogger=None, batch=False, variants: VariantCache=None) -> None:
     bpy.context.evaluated_depsgraph_get().update()
-    export = FileExport(file_path, file_format, logger=logger, batch=batch)
+    export = FileExport(file_path, file_format, logger=logger, batch=batch, variants=variants)
     export.export_template()
 
 def get_export_stats(context: Context) -> None:
@@ -67,6 +65,17 @@ def get_export_stats(context: Context) -> None:
         _export_stats = {}
         context.window_manager.popup_menu(draw_popup, title=f"Model created succesfully!", icon='CHECKMARK')
 
+def take_export_stats() -> dict[str, list[str]]:
+    """Returns and clears the stats of the last MDL export without showing them."""
+    global _export_stats
+    export_stats  = _export_stats
+    _export_stats = {}
+    return export_stats
+
+def set_export_stats(export_stats: dict[str, list[str]]) -> None:
+    global _export_stats
+    _export_stats = export_stats
+
 def get_export_settings(format: str) -> dict[str, str | int | bool]:
     if format == 'GLTF':
         return {
@@ -106,19 +115,26 @@ def get_export_settings(format: str) -> dict[str, str | int | bool]:
     
 
 class FileExport:
-    def __init__(self, file_path: Path, file_format: str, logger: YetAnotherLogger=None, batch=False):
+    def __init__(self, file_path: Path, file_format: str, logger: YetAnotherLogger=None, batch=False, variants: VariantCache=None):
         self.logger      = logger
         self.file_format = file_format
         self.file_path   = file_path
         self.batch       = batch
+        self.variants    = variants if file_format == 'MDL' else None
  
     def export_template(self):
         global _export_stats
 
+        from ..io.model import ModelExport, SceneHandler, get_neck_morphs
+        
         try:
             scene_handler = SceneHandler(logger=self.logger, batch=self.batch)
             scene_handler.prepare_scene()
-            scene_handler.process_scene()
+            if self.variants:
+                export_objs = self.variants.get_export_objs(scene_handler)
+            else:
+                scene_handler.process_scene()
+                export_objs = scene_handler.export_objs
 
             if self.logger:
                 self.logger.log_separator()
@@ -143,11 +159,12 @@ class FileExport:
                     self.logger.log(f"Converting to MDL...", 2)
                 model_props   = get_studio_props().model
                 _export_stats = ModelExport.export_scene(
-                                                scene_handler.export_objs, 
+                                                export_objs, 
                                                 str(self.file_path) + ".mdl",
                                                 model_props.use_lods,
                                                 get_neck_morphs(model_props.neck_morph),
                                                 logger=self.logger,
+                                                tangents=model_props.tangents,
                                                 **model_props.get_flags()
                                             )
         
@@ -155,6 +172,8 @@ class FileExport:
             raise e
 
         finally:
+            if self.variants:
+                self.variants.park()
             if scene_handler:
                 scene_handler.restore_meshes()
         
\ No newline at end of file
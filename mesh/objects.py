@@ -2,7 +2,11 @@ import re
 import bpy
 
 from typing    import Literal
-from bpy.types import Object, Depsgraph
+from bpy.types import Object, Depsgraph, Mesh
+
+
+# Built-in attributes the exporter relies on for topology, normals and seams.
+EXPORT_ATTRIBUTES = {"position", "sharp_face", "sharp_edge", "material_index", "custom_normal", "xiv_flow"}
 
 
 def xiv_mesh_check(obj: Object) -> bool:
@@ -79,13 +83,79 @@ def safe_object_delete(obj: Object) -> None:
     except Exception as e:
         print(f"Error deleting object {obj.name}: {e}")
 
-def copy_mesh_object(source_obj: Object, depsgraph: Depsgraph, export=True) -> Object:
-    """Fast evaluated mesh copy without depsgraph update."""
+def export_layers(mesh: Mesh) -> tuple[set[str], set[str]]:
+    """UV maps and colour attributes read by the MDL exporter. The first UV map is always used for tangents."""
+    from ..xivpy.model import XIV_COL, XIV_UV
+
+    uv_layers  = {layer.name for idx, layer in enumerate(mesh.uv_layers) 
+                  if idx == 0 or layer.name.lower().startswith(XIV_UV)}
+    col_layers = {layer.name for layer in mesh.color_attributes 
+                  if layer.name.lower().startswith(XIV_COL) or layer.name == "xiv_flow"}
+    
+    return uv_layers, col_layers
+
+def strip_export_layers(mesh: Mesh) -> None:
+    """Removes UV maps, colour layers, custom attributes and sculpt data that the MDL exporter doesn't read."""
+    from .face_order import FACE_INDEX
+
+    uv_layers, col_layers = export_layers(mesh)
+    all_uvs   = {layer.name for layer in mesh.uv_layers}
+    all_cols  = {layer.name for layer in mesh.color_attributes}
+
+    for name in all_uvs - uv_layers:
+        mesh.uv_layers.remove(mesh.uv_layers[name])
+
+    for name in all_cols - col_layers:
+        mesh.color_attributes.remove(mesh.color_attributes[name])
+
+    custom_attributes = [
+        attr.name for attr in mesh.attributes
+        if attr.name not in EXPORT_ATTRIBUTES 
+        and attr.name != FACE_INDEX
+        and attr.name not in all_uvs | all_cols
+        and (not attr.name.startswith(".") or attr.name.startswith(".sculpt"))
+        ]
+    
+    for name in custom_attributes:
+        attribute = mesh.attributes.get(name)
+        if attribute:
+            mesh.attributes.remove(attribute)
+
+def _has_weights(mesh: Mesh) -> bool:
+    # Stops at the first weighted vertex, only meshes without weights are scanned in full.
+    return any(len(vert.groups) for vert in mesh.vertices)
+
+def lightweight_mesh(source_obj: Object, eval_obj: Object, depsgraph: Depsgraph) -> Mesh | None:
+    """
+    Copies the evaluated mesh as is, instead of re-evaluating the object to preserve every data layer.
+    Returns None if the evaluation dropped any data the exporter needs.
+    """
+    mesh = bpy.data.meshes.new_from_object(eval_obj, preserve_all_data_layers=False, depsgraph=depsgraph)
+
+    uv_layers, col_layers = export_layers(source_obj.data)
+    missing_layers  = (
+        any(name not in mesh.uv_layers for name in uv_layers) 
+        or any(name not in mesh.color_attributes for name in col_layers)
+        or (source_obj.data.has_custom_normals and not mesh.has_custom_normals)
+        or (len(source_obj.vertex_groups) > 0 and _has_weights(source_obj.data) and not _has_weights(mesh))
+        )
+    
+    if missing_layers:
+        bpy.data.meshes.remove(mesh, do_unlink=True)
+        return None
+    
+    strip_export_layers(mesh)
+    return mesh
+
+def copy_mesh_object(source_obj: Object, depsgraph: Depsgraph, export=True, lightweight=False) -> Object:
+    """Fast evaluated mesh copy without depsgraph update. 
+    Lightweight copies only keep the data layers used by the MDL exporter."""
 
     eval_obj  = source_obj.evaluated_get(depsgraph)
+    new_mesh  = lightweight_mesh(source_obj, eval_obj, depsgraph) if lightweight else None
 
     new_obj      = source_obj.copy()
-    new_obj.data = bpy.data.meshes.new_from_object(
+    new_obj.data = new_mesh or bpy.data.meshes.new_from_object(
                     eval_obj, 
                     preserve_all_data_layers=True, 
                     depsgraph=depsgraph
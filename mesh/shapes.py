@@ -1,54 +1,86 @@
 import numpy as np
 
-from numpy        import single, double
-from bpy.types    import Object, Depsgraph
-from numpy.typing import NDArray
+from numpy           import single, double
+from bpy.types       import Object, Depsgraph
+from numpy.typing    import NDArray
+from collections.abc import Iterable
 
-from .objects     import evaluate_obj
+from .objects        import evaluate_obj
+from .weights        import read_group_weights
 
 
-def get_shape_mix(source_obj: Object, extra_key: str="") -> NDArray[single]:
+def get_group_masks(obj: Object, group_names: Iterable[str]) -> dict[str, NDArray[double]]:
+    """Dense per vertex weights of the groups, read in a single sweep. Missing groups are left out, Blender applies the key unmasked then."""
+    indices: dict[int, str] = {}
+    for name in set(group_names):
+        v_group = obj.vertex_groups.get(name)
+        if v_group is not None:
+            indices[v_group.index] = name
+
+    if not indices:
+        return {}
+    
+    verts, groups, weights = read_group_weights(obj, indices)
+    masks = {}
+    for group_idx, name in indices.items():
+        selected    = groups == group_idx
+        mask        = np.zeros(len(obj.data.vertices), dtype=double)
+        mask[verts[selected]] = weights[selected]
+        masks[name] = mask
+
+    return masks
+
+def get_shape_mixes(source_obj: Object, extra_keys: Iterable[str]=()) -> tuple[NDArray[single], dict[str, NDArray[single]]]:
     """
-    Get current mix of shape keys from a mesh. 
-    The extra key is optional and will blend that key in at its full value.
+    Get current mix of shape keys from a mesh, and the mix with each extra key blended in at its full value.
+    Values are clamped to the slider range and masked by the key's vertex group, the same as Blender's own mix.
+    Every key block is read once, however many extra keys are asked for.
     """
     key_blocks = source_obj.data.shape_keys.key_blocks
     vert_count = len(source_obj.data.vertices)
-    co_bases   = {}
-
-    basis_co = np.zeros(vert_count * 3, dtype=double)
-    key_blocks[0].data.foreach_get("co", basis_co)
-    co_bases[key_blocks[0].name] = basis_co
+    extra_keys = set(extra_keys)
+    key_co     = {}
 
-    # We need a copy of the main basis to mix our keys with
-    mix_coords = basis_co.copy()
+    for key in key_blocks:
+        coords = np.zeros(vert_count * 3, dtype=double)
+        key.data.foreach_get("co", coords)
+        key_co[key.name] = coords
 
-    # Account for keys with a different relative shape
+    masks   = get_group_masks(source_obj, [key.vertex_group for key in key_blocks[1:] if key.vertex_group])
+    offsets = {}
+    blends  = {}
     for key in key_blocks[1:]:
-        if key.relative_key.name in co_bases:
+        blend = min(max(key.value, key.slider_min), key.slider_max)
+        if key.name not in extra_keys and (blend == 0 or key.mute):
             continue
-        relative_co = np.zeros(vert_count * 3, dtype=double)
-        key.relative_key.data.foreach_get("co", relative_co)
-        co_bases[key.relative_key.name] = relative_co
 
-    for key in key_blocks[1:]:
-        if key.name == extra_key:
-            keep  = True
-            blend = 1
-        else:
-            keep  = False
-            blend = key.value
-            
-        if keep or (key.value != 0 and not key.mute):
-            relative_key = key.relative_key.name
-            key_coords   = np.zeros(vert_count * 3, dtype=double)
-            key.data.foreach_get("co", key_coords)
-
-            # Use relative key coordinates to get offset
-            offset      = key_coords - co_bases[relative_key]
-            mix_coords += offset * blend
+        # Use relative key coordinates to get offset
+        offset = key_co[key.name] - key_co[key.relative_key.name]
+        if key.vertex_group in masks:
+            offset = (offset.reshape(-1, 3) * masks[key.vertex_group][:, None]).ravel()
+
+        offsets[key.name] = offset
+        blends[key.name]  = 0 if key.mute else blend
+
+    mix_coords = key_co[key_blocks[0].name].copy()
+    for key_name, offset in offsets.items():
+        if blends[key_name]:
+            mix_coords += offset * blends[key_name]
     
-    return mix_coords.astype(single)
+    extra_mixes = {}
+    for key_name in extra_keys:
+        if key_name in offsets:
+            extra_mixes[key_name] = (mix_coords + offsets[key_name] * (1 - blends[key_name])).astype(single)
+
+    return mix_coords.astype(single), extra_mixes
+
+def get_shape_mix(source_obj: Object, extra_key: str="") -> NDArray[single]:
+    """
+    Get current mix of shape keys from a mesh. 
+    The extra key is optional and will blend that key in at its full value.
+    """
+    mix_coords, extra_mixes = get_shape_mixes(source_obj, [extra_key] if extra_key else [])
+    return extra_mixes.get(extra_key, mix_coords)
 
 def create_co_cache(co_cache: dict[str, None], shapes: dict[str, Object], target: Object, base_key: str, vert_count: int, depsgraph: Depsgraph) -> None:
     '''Takes a dict of shape key names of relative keys on a mesh and creates a cache of their coordinates per key.'''
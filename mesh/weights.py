@@ -1,4 +1,7 @@
+import zlib
+import json
 import bmesh
+import struct
 import numpy as np
 
 from numpy           import float32, uint32
@@ -6,20 +9,46 @@ from bpy.types       import Object, VertexGroup
 from numpy.typing    import NDArray
 from collections.abc import Iterable
 
-from ..props.studio  import YASGroup
+from ..props.studio  import YASGroup, STORED_WEIGHTS
 
 
+# The exporter stores weights as bytes.
+WEIGHT_STEP = 1 / 255
+
 def add_to_vgroup(weight_matrix: NDArray, v_group: VertexGroup) -> NDArray:
     indices = np.flatnonzero(weight_matrix[:, v_group.index])
     weights = weight_matrix[:, v_group.index][indices]
     if len(indices) == 0:
         return
 
+    add_weights(v_group, indices, weights)
+
+def add_weights(v_group: VertexGroup, indices: NDArray[uint32], weights: NDArray[float32], mode: str='ADD', step: float=0) -> float:
+    '''A step snaps the weights to a grid first, capping the add() calls at one per grid value. 
+    Weights below half a step snap to 0 and are dropped unless the mode is REPLACE.
+    Returns the largest deviation introduced by the snapping.'''
+    deviation = 0.0
+    if step:
+        weights, deviation = quantise_weights(weights, step)
+        if mode != 'REPLACE':
+            nonzero = weights > 0
+            indices = indices[nonzero]
+            weights = weights[nonzero]
+        if len(indices) == 0:
+            return deviation
+
     grouped_indices, unique_weights = group_weights(indices, weights)
     
     for array_idx, vert_indices in enumerate(grouped_indices):
         vert_indices = vert_indices.tolist()
-        v_group.add(vert_indices, unique_weights[array_idx], type='ADD')
+        v_group.add(vert_indices, float(unique_weights[array_idx]), type=mode)
+
+    return deviation
+
+def quantise_weights(weights: NDArray[float32], step: float=WEIGHT_STEP) -> tuple[NDArray[float32], float]:
+    snapped   = (np.round(weights / step) * step).astype(float32)
+    deviation = float(np.abs(snapped - weights).max()) if len(weights) else 0.0
+    return snapped, deviation
 
 def group_weights(indices: NDArray[uint32], weights: NDArray[float32]) -> tuple[list[NDArray[uint32]], NDArray[float32]]:
     '''Groups vert indices based on unique weight values. 
@@ -35,78 +64,74 @@ def group_weights(indices: NDArray[uint32], weights: NDArray[float32]) -> tuple[
 
     return grouped_indices, unique_weights
 
-def remove_vertex_groups(obj: Object, skeleton: Object, prefix: tuple[str, ...], store_yas=False) -> None:
-        """Can remove any vertex group and add weights to parent group."""
+def read_group_weights(obj: Object, groups: Iterable[int]) -> tuple[NDArray[uint32], NDArray[uint32], NDArray[float32]]:
+    '''Reads the weights of the given groups in a single sweep over the mesh. 
+    Returns sparse vertex index, group index and weight arrays, ordered by vertex.'''
+    groups = set(groups)
+    sparse = [
+        (vert.index, group.group, group.weight) 
+        for vert in obj.data.vertices 
+        for group in vert.groups 
+        if group.group in groups and group.weight
+        ]
+    
+    sparse = np.array(sparse, dtype=np.float64).reshape(-1, 3)
+    return sparse[:, 0].astype(uint32), sparse[:, 1].astype(uint32), sparse[:, 2].astype(float32)
+
+def remove_groups(obj: Object, v_groups: Iterable[VertexGroup]) -> None:
+    '''Groups are collected before removal, removing while iterating obj.vertex_groups skips entries.
+    Highest index first, so the remaining weights never have to be renumbered.'''
+    v_groups = sorted(v_groups, key=lambda v_group: v_group.index, reverse=True)
+    if not v_groups:
+        return
+    
+    if len(v_groups) == len(obj.vertex_groups):
+        obj.vertex_groups.clear()
+        return
+    
+    for v_group in v_groups:
+        obj.vertex_groups.remove(v_group)
+
+def remove_vertex_groups(obj: Object, skeleton: Object, prefix: tuple[str, ...], store_yas=False, step: float=0) -> float:
+        """Can remove any vertex group and add weights to parent group. 
+        A step quantises the parent weights, merged weights below half a step are lost. Returns the largest deviation."""
         group_to_parent = _get_group_parent(obj, skeleton, prefix)
-        source_groups   = [value for value in group_to_parent.keys()]
 
-        if not source_groups:
-            return
+        if not group_to_parent:
+            return 0.0
 
-        weight_matrix = _create_weight_matrix(obj, skeleton, group_to_parent, source_groups)
+        vert_idx, group_idx, weights = read_group_weights(obj, group_to_parent.keys())
 
-        # Adds weights to parent
-        updated_groups = {value for value in group_to_parent.values()}
-        for v_group in obj.vertex_groups:
-            if v_group.index not in updated_groups:
-                continue
+        _create_missing_parents(obj, skeleton, group_to_parent)
+        _resolve_parents(group_to_parent)
 
-            add_to_vgroup(weight_matrix, v_group)
+        # Adds weights to parent
+        deviation = 0.0
+        for parent, (indices, parent_weights) in _fold_weights(obj, group_to_parent, vert_idx, group_idx, weights).items():
+            deviation = max(deviation, add_weights(obj.vertex_groups[parent], indices, parent_weights, step=step))
 
         if store_yas:
-            _store_yas_groups(obj, skeleton, group_to_parent, weight_matrix)
+            _store_yas_groups(obj, skeleton, group_to_parent, vert_idx, group_idx, weights)
 
-        for v_group in obj.vertex_groups:
-            if v_group.name.startswith(prefix):
-                obj.vertex_groups.remove(v_group)
+        remove_groups(obj, [v_group for v_group in obj.vertex_groups if v_group.name.startswith(prefix)])
+        return deviation
 
-def _store_yas_groups(obj: Object, skeleton: Object, group_to_parent: dict[int, int], weight_matrix: NDArray[float32]) -> None:
-    yas_groups: Iterable[YASGroup] = obj.yas.v_groups
-    
-    existing_groups = [group.name for group in yas_groups]
+def _store_yas_groups(obj: Object, skeleton: Object, group_to_parent: dict[int, int], vert_idx: NDArray[uint32], group_idx: NDArray[uint32], weights: NDArray[float32]) -> None:
+    stored_groups   = get_stored_weights(obj)
+    existing_groups = {group[0] for group in stored_groups}
     for group in group_to_parent:
         group_name = obj.vertex_groups[group].name
         if group_name in existing_groups:
             continue
 
-        indices = np.flatnonzero(weight_matrix[:, group])
-        weights = weight_matrix[:, group][indices]
-
-        new_group: YASGroup  = yas_groups.add()
-        new_group.name       = group_name
-        new_group.parent     = skeleton.data.bones.get(group_name).parent.name
+        group_mask = group_idx == group
+        parent     = skeleton.data.bones.get(group_name).parent.name
+        stored_groups.append((group_name, parent, vert_idx[group_mask], weights[group_mask]))
 
-        if len(indices) == 0:
-            continue
-
-        for _ in range(len(indices)):
-            new_group.vertices.add()
-
-        new_group.vertices.foreach_set("idx", indices)
-        new_group.vertices.foreach_set("value", weights)
+    set_stored_weights(obj, stored_groups)
 
 def restore_yas_groups(obj: Object) -> None:
-    yas_groups: Iterable[YASGroup] = obj.yas.v_groups
-    yas_to_parent: dict[str, str] = {}
-    stored_weights: dict[str, tuple[list[NDArray], NDArray]] = {}
-
-    for v_group in yas_groups:
-        verts =  len(v_group.vertices)
-        yas_to_parent[v_group.name] = v_group.parent
-        if not verts:
-            continue
-
-        indices = np.zeros(verts, dtype=uint32)
-        weights = np.zeros(verts, dtype=float32)
-
-        v_group.vertices.foreach_get("idx", indices)
-        v_group.vertices.foreach_get("value", weights)
-
-        grouped_indices, unique_weights = group_weights(indices, weights)
-        
-        stored_weights[v_group.name] = (grouped_indices, unique_weights)
-
-    for yas_name, parent_name in yas_to_parent.items():
+    for yas_name, parent_name, indices, weights in get_stored_weights(obj):
         parent = obj.vertex_groups.get(parent_name)
         if not parent: 
             continue
@@ -116,16 +141,89 @@ def restore_yas_groups(obj: Object) -> None:
         else: 
             yas_group = obj.vertex_groups.new(name=yas_name)
 
-        if yas_name not in stored_weights:
+        if len(indices) == 0:
             continue
 
-        weights = stored_weights[yas_name]
-        for array_idx, vert_indices in enumerate(weights[0]):
+        grouped_indices, unique_weights = group_weights(indices, weights)
+        for array_idx, vert_indices in enumerate(grouped_indices):
             vert_indices = vert_indices.tolist()
-            parent.add(vert_indices, weights[1][array_idx], type='SUBTRACT')
-            yas_group.add(vert_indices, weights[1][array_idx], type='REPLACE')
+            parent.add(vert_indices, float(unique_weights[array_idx]), type='SUBTRACT')
+            yas_group.add(vert_indices, float(unique_weights[array_idx]), type='REPLACE')
+    
+    obj.yas.clear_weights()
+
+def get_stored_weights(obj: Object) -> list[tuple[str, str, NDArray[uint32], NDArray[float32]]]:
+    '''Returns the name, parent, vertex indices and weights of every stored group.'''
+    if STORED_WEIGHTS in obj.yas:
+        return unpack_weights(bytes(obj.yas[STORED_WEIGHTS]))
+    
+    # Collection storage from older versions.
+    yas_groups: Iterable[YASGroup] = obj.yas.v_groups
+    stored_groups = []
+    for v_group in yas_groups:
+        verts   = len(v_group.vertices)
+        indices = np.zeros(verts, dtype=uint32)
+        weights = np.zeros(verts, dtype=float32)
+        if verts:
+            v_group.vertices.foreach_get("idx", indices)
+            v_group.vertices.foreach_get("value", weights)
+
+        stored_groups.append((v_group.name, v_group.parent, indices, weights))
+
+    return stored_groups
+
+def set_stored_weights(obj: Object, stored_groups: list[tuple[str, str, NDArray[uint32], NDArray[float32]]]) -> None:
+    obj.yas.clear_weights()
+    if stored_groups:
+        obj.yas[STORED_WEIGHTS] = pack_weights(stored_groups)
+
+def migrate_stored_weights(obj: Object) -> None:
+    '''Moves weights stored in the YASGroup collection to the packed blob.'''
+    if obj.yas.v_groups:
+        set_stored_weights(obj, get_stored_weights(obj))
+
+def pack_weights(stored_groups: list[tuple[str, str, NDArray[uint32], NDArray[float32]]]) -> bytes:
+    '''Layout before compression: header length, JSON header of (name, parent, count), 
+    then the delta encoded vertex indices and weights of all groups.'''
+    header  = []
+    deltas  = []
+    values  = []
+    for name, parent, indices, weights in stored_groups:
+        order   = np.argsort(indices, kind='stable')
+        indices = np.asarray(indices, dtype=np.int64)[order]
+        header.append((name, parent, len(indices)))
+        deltas.append(np.diff(indices, prepend=0).astype("<u4"))
+        values.append(np.asarray(weights)[order].astype("<f4"))
+
+    header  = json.dumps(header).encode()
+    payload = b"".join((
+        struct.pack("<I", len(header)), 
+        header, 
+        np.concatenate(deltas).tobytes(), 
+        np.concatenate(values).tobytes()
+        ))
     
-    yas_groups.clear()
+    return zlib.compress(payload)
+
+def unpack_weights(blob: bytes) -> list[tuple[str, str, NDArray[uint32], NDArray[float32]]]:
+    payload    = zlib.decompress(blob)
+    header_len = struct.unpack_from("<I", payload)[0]
+    header     = json.loads(payload[4:4 + header_len])
+
+    offset  = 4 + header_len
+    total   = sum(group[2] for group in header)
+    deltas  = np.frombuffer(payload, dtype="<u4", count=total, offset=offset)
+    weights = np.frombuffer(payload, dtype="<f4", count=total, offset=offset + total * 4)
+
+    stored_groups = []
+    start = 0
+    for name, parent, count in header:
+        end     = start + count
+        indices = np.cumsum(deltas[start:end], dtype=uint32)
+        stored_groups.append((name, parent, indices, weights[start:end].astype(float32)))
+        start   = end
+
+    return stored_groups
 
 def _get_group_parent(obj: Object, skeleton: Object, prefix: set[str]) -> dict[int, int | str]:
     group_to_parent = {}
@@ -144,45 +242,41 @@ def _get_group_parent(obj: Object, skeleton: Object, prefix: set[str]) -> dict[i
     
     return group_to_parent
 
-def _create_weight_matrix(obj: Object, skeleton: Object, group_to_parent: dict[int, int | str], source_groups: set[int]) -> NDArray[float32]:
-
-    def find_parent_recursive(parent_idx: int):
-        parent = group_to_parent[parent_idx]
-        if parent in group_to_parent:
-           parent = find_parent_recursive(parent)
-        return parent
-
-    verts          = len(obj.data.vertices)
-    missing_groups = {value for value in group_to_parent.values() if isinstance(value, str)}
-    max_groups     = len(obj.vertex_groups) + len(missing_groups)
-    weight_matrix  = np.zeros((verts, max_groups), dtype=float32)
-    
-    if len(source_groups) == 1:
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-
-        group_idx = source_groups[0]
-        deform_layer = bm.verts.layers.deform.active
-        for vert_idx, vert in enumerate(bm.verts):
-            weight_matrix[vert_idx, group_idx] = vert[deform_layer].get(group_idx, 0)
-
-        bm.free()
-    else:
-        for vertex_idx, vertex in enumerate(obj.data.vertices):
-            for group in vertex.groups:
-                if group.group in source_groups:
-                    weight_matrix[vertex_idx, group.group] = group.weight
-
-    _create_missing_parents(obj, skeleton, group_to_parent)
-
+def _resolve_parents(group_to_parent: dict[int, int]) -> None:
+    '''Points every removed group to its closest ancestor that is kept.'''
     for group_idx, parent in group_to_parent.items():
-        if parent in group_to_parent:
-            parent = find_parent_recursive(parent)
-            group_to_parent[group_idx] = parent
-            
-        weight_matrix[:, parent] += weight_matrix[:, group_idx]
-
-    return weight_matrix
+        while parent in group_to_parent:
+            parent = group_to_parent[parent]
+        group_to_parent[group_idx] = parent
+
+def _fold_weights(obj: Object, group_to_parent: dict[int, int], vert_idx: NDArray[uint32], group_idx: NDArray[uint32], weights: NDArray[float32]) -> dict[int, tuple[NDArray[uint32], NDArray[float32]]]:
+    '''Sums the sparse child weights per parent and vertex. Returns the summed vertex indices and weights of each parent.'''
+    if len(weights) == 0:
+        return {}
+
+    vert_count = len(obj.data.vertices)
+    parent_map = np.zeros(max(group_to_parent) + 1, dtype=np.int64)
+    parent_map[list(group_to_parent.keys())] = list(group_to_parent.values())
+
+    keys = parent_map[group_idx] * vert_count + vert_idx
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+    summed = np.zeros(len(unique_keys), dtype=float32)
+    np.add.at(summed, inverse, weights)
+
+    parents      = unique_keys // vert_count
+    indices      = (unique_keys % vert_count).astype(uint32)
+    split_points = np.flatnonzero(np.diff(parents)) + 1
+
+    folded = {}
+    for parent_indices, parent_weights, parent in zip(
+            np.split(indices, split_points), 
+            np.split(summed, split_points), 
+            parents[np.concatenate(([0], split_points))]
+            ):
+        folded[int(parent)] = (parent_indices, parent_weights)
+
+    return folded
 
 def _create_missing_parents(obj: Object, skeleton: Object, group_to_parent: dict[int, int | str]) -> None:
     parent_to_group = {}
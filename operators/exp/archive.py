@@ -0,0 +1,352 @@
+import os
+import json
+import zlib
+import struct
+import hashlib
+import zipfile
+import tempfile
+
+from copy               import copy
+from typing             import BinaryIO, Iterable
+from pathlib            import Path
+from zipfile            import ZipFile, ZipInfo
+from itertools          import chain
+from collections        import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from ...xivpy.pmp       import Modpack
+
+
+HASH_CACHE_NAME = "yet_another_hashes.json"
+
+CHUNK_SIZE  = 1 << 20
+SAMPLE_SIZE = 1 << 16
+
+# Upper bound on the source bytes being compressed or waiting to be written, compressed output is held alongside.
+MAX_PENDING_BYTES = 256 << 20
+
+# Deflate output above this ratio isn't worth the decompression cost, the member is stored instead.
+STORE_RATIO = 0.95
+
+def member_key(relative_path: str) -> str:
+    """Penumbra resolves relative paths case insensitively with either separator."""
+    return relative_path.replace("\\", "/").lower()
+
+def stream_digest(stream: BinaryIO) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+def file_hashes(file_path: Path) -> tuple[int, str]:
+    """CRC and content digest of a file in a single read."""
+    crc    = 0
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            hasher.update(chunk)
+
+    return crc, hasher.hexdigest()
+
+def file_redirects(pmp: Modpack) -> list[dict[str, str]]:
+    """Every game path to relative path mapping in the modpack."""
+    redirects = [pmp.default.Files] if pmp.default.Files else []
+    for group in pmp.groups:
+        for option in chain(group.Options or [], group.Containers or []):
+            files = getattr(option, "Files", None)
+            if files:
+                redirects.append(files)
+
+    return redirects
+
+def _strip_zip64(extra: bytes) -> bytes:
+    """The local header writer appends its own Zip64 field when the member needs one."""
+    stripped = b""
+    offset   = 0
+    while offset + 4 <= len(extra):
+        field_id, size = struct.unpack_from("<HH", extra, offset)
+        if field_id != 0x0001:
+            stripped += extra[offset:offset + 4 + size]
+        offset += 4 + size
+
+    return stripped
+
+def append_member(archive: ZipFile, member: ZipInfo, chunks: Iterable[bytes]) -> None:
+    """
+    Writes a member whose compressed data is already known.
+    ZipFile has no public API for this, the local header and data are written the same way ZipFile.write does.
+    """
+    member.header_offset = archive.fp.tell()
+    archive.fp.write(member.FileHeader())
+    for chunk in chunks:
+        archive.fp.write(chunk)
+
+    archive.filelist.append(member)
+    archive.NameToInfo[member.filename] = member
+    archive.start_dir = archive.fp.tell()
+
+def read_member(source: ZipFile, info: ZipInfo) -> Iterable[bytes]:
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+
+    remaining = info.compress_size
+    while remaining:
+        chunk = source.fp.read(min(remaining, CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member: {info.filename}")
+        remaining -= len(chunk)
+        yield chunk
+
+def copy_member(source: ZipFile, info: ZipInfo, archive: ZipFile) -> None:
+    """Copies the compressed bytes of a member verbatim."""
+    # Sizes and CRC are known up front, so the copy never needs a data descriptor.
+    member            = copy(info)
+    member.flag_bits &= ~0x08
+    member.extra      = _strip_zip64(info.extra)
+    append_member(archive, member, read_member(source, info))
+
+def compress_file(file_path: Path, name: str, level: int) -> tuple[ZipInfo, bytes]:
+    """
+    Deflates a file in memory, zlib releases the GIL so this runs in parallel on a thread pool.
+    Files whose first block doesn't compress, or that don't compress overall, are stored.
+    """
+    data   = file_path.read_bytes()
+    member = ZipInfo.from_file(file_path, name)
+    member.file_size = len(data)
+    member.CRC       = zlib.crc32(data)
+
+    compressed = None
+    sample     = data[:SAMPLE_SIZE]
+    if level > 0 and sample and len(zlib.compress(sample, 1)) < len(sample) * STORE_RATIO:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) >= len(data) * STORE_RATIO:
+            compressed = None
+
+    if compressed is None:
+        member.compress_type = zipfile.ZIP_STORED
+        compressed           = data
+    else:
+        member.compress_type = zipfile.ZIP_DEFLATED
+
+    member.compress_size = len(compressed)
+    return member, compressed
+
+
+class FileHashCache:
+    """
+    Keeps the hashes of source files next to the modpack output, so repackaging doesn't re-read unchanged files.
+    Entries are keyed by path and only trusted while the file size and modification time still match.
+    """
+
+    def __init__(self, folder: Path):
+        self.file_path = folder / HASH_CACHE_NAME
+        self.modified  = False
+
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                self.entries: dict[str, list] = json.load(file).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def get(self, file_path: Path) -> tuple[int, str]:
+        """Returns the CRC and digest of the file."""
+        stat  = file_path.stat()
+        key   = str(file_path)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            entry = [stat.st_size, stat.st_mtime_ns, *file_hashes(file_path)]
+            self.entries[key] = entry
+            self.modified     = True
+
+        return entry[2], entry[3]
+
+    def save(self) -> None:
+        """Drops entries for files that no longer exist."""
+        entries = {key: entry for key, entry in self.entries.items() if Path(key).is_file()}
+        if not self.modified and len(entries) == len(self.entries):
+            return
+
+        temp_path = self.file_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"entries": entries}, file)
+        os.replace(temp_path, self.file_path)
+
+        self.entries  = entries
+        self.modified = False
+
+
+class ModpackArchive:
+    """
+    Writes a modpack straight into its .pmp without staging the mod files in a folder first.
+    Sources are files on disk or members of an existing archive, only the ones the modpack references are written.
+    Archive members that aren't replaced by a file with different content are copied without recompressing them.
+    Sources with identical content are stored once and their references remapped to the first copy.
+    New files are compressed on a thread pool and written in source order, so the output is deterministic.
+    """
+
+    def __init__(self, pmp: Modpack, level: int=6, workers: int=0, hashes: FileHashCache=None):
+        self.pmp     = pmp
+        self.level   = level
+        self.workers = workers or os.cpu_count() or 1
+        self.hashes  = hashes
+        self.source  : ZipFile | None = None
+        self.sources : dict[str, tuple[str, Path | ZipInfo]] = {}
+        self.replaced: dict[str, ZipInfo] = {}
+
+        self.orphans   : list[str] = []
+        self.duplicates: list[str] = []
+        self.copied    : int = 0
+
+    def add_file(self, file_path: Path, relative_path: str) -> None:
+        """Later sources replace earlier ones with the same relative path."""
+        key = member_key(relative_path)
+        if key in self.sources and isinstance(self.sources[key][1], ZipInfo):
+            self.replaced[key] = self.sources[key][1]
+
+        self.sources[key] = (relative_path.replace("\\", "/"), file_path)
+
+    def add_archive(self, file_path: Path) -> None:
+        """Only reads the central directory, the metadata JSON is skipped since it's written from the modpack."""
+        self.source = ZipFile(file_path, "r")
+        for info in self.source.infolist():
+            if info.is_dir() or ("/" not in info.filename and info.filename.endswith(".json")):
+                continue
+            self.sources[member_key(info.filename)] = (info.filename, info)
+
+    def write(self, output: Path) -> None:
+        temp_output = output.with_name(f"{output.name}.tmp")
+        try:
+            self._keep_unchanged()
+            self._deduplicate()
+            referenced = {member_key(path) for redirects in file_redirects(self.pmp) for path in redirects.values()}
+            self.orphans = [name for key, (name, entry) in self.sources.items() if key not in referenced]
+
+            with ZipFile(temp_output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                self._write_json(archive)
+                self._write_members(archive, [self.sources[key] for key in self.sources if key in referenced])
+
+            # The output is usually the source archive, it has to be released before it's replaced.
+            self.close()
+            os.replace(temp_output, output)
+        finally:
+            self.close()
+            temp_output.unlink(missing_ok=True)
+
+    def _write_members(self, archive: ZipFile, members: list[tuple[str, Path | ZipInfo]]) -> None:
+        """
+        Bounds the files in flight by count and by size so large mods don't have to fit in memory.
+        A file larger than the byte budget is compressed on its own once everything before it is written.
+        """
+        pending      : deque[tuple[Future | ZipInfo, int]] = deque()
+        pending_bytes: int = 0
+        
+        def write_next() -> None:
+            nonlocal pending_bytes
+            entry, size = pending.popleft()
+            if isinstance(entry, ZipInfo):
+                copy_member(self.source, entry, archive)
+                self.copied += 1
+            else:
+                member, data = entry.result()
+                append_member(archive, member, (data,))
+            pending_bytes -= size
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for name, entry in members:
+                if isinstance(entry, ZipInfo):
+                    # Copies are streamed in chunks, they don't count towards the budget.
+                    pending.append((entry, 0))
+                else:
+                    size = entry.stat().st_size
+                    while pending and pending_bytes + size > MAX_PENDING_BYTES:
+                        write_next()
+
+                    pending.append((executor.submit(compress_file, entry, name, self.level), size))
+                    pending_bytes += size
+                
+                while len(pending) > self.workers * 2:
+                    write_next()
+
+            while pending:
+                write_next()
+
+    def close(self) -> None:
+        if self.source:
+            self.source.close()
+            self.source = None
+
+    def _size(self, entry: Path | ZipInfo) -> int:
+        return entry.file_size if isinstance(entry, ZipInfo) else entry.stat().st_size
+
+    def _file_hashes(self, file_path: Path) -> tuple[int, str]:
+        return self.hashes.get(file_path) if self.hashes else file_hashes(file_path)
+
+    def _crc(self, entry: Path | ZipInfo) -> int:
+        return entry.CRC if isinstance(entry, ZipInfo) else self._file_hashes(entry)[0]
+
+    def _digest(self, entry: Path | ZipInfo) -> str:
+        if not isinstance(entry, ZipInfo):
+            return self._file_hashes(entry)[1]
+        
+        with self.source.open(entry) as stream:
+            return stream_digest(stream)
+
+    def _keep_unchanged(self) -> None:
+        """Re-exported files that match the member they replace keep the member, size and CRC only decide which are hashed."""
+        for key, info in self.replaced.items():
+            name, file = self.sources[key]
+            if info.file_size != file.stat().st_size or info.CRC != self._crc(file):
+                continue
+
+            if self._digest(info) == self._digest(file):
+                self.sources[key] = (info.filename, info)
+
+    def _deduplicate(self) -> None:
+        """Only sources that share a size and CRC are hashed, member CRCs come from the central directory."""
+        candidates: dict[int, list[str]] = {}
+        for key, (name, entry) in self.sources.items():
+            candidates.setdefault(self._size(entry), []).append(key)
+
+        remap: dict[str, str] = {}
+        for keys in candidates.values():
+            if len(keys) < 2:
+                continue
+
+            by_crc: dict[int, list[str]] = {}
+            for key in keys:
+                by_crc.setdefault(self._crc(self.sources[key][1]), []).append(key)
+
+            for matches in by_crc.values():
+                if len(matches) < 2:
+                    continue
+
+                first: dict[str, str] = {}
+                for key in matches:
+                    digest = self._digest(self.sources[key][1])
+                    if digest in first:
+                        remap[key] = first[digest]
+                    else:
+                        first[digest] = key
+
+        for redirects in file_redirects(self.pmp):
+            for game_path, relative_path in redirects.items():
+                key = member_key(relative_path)
+                if key in remap:
+                    redirects[game_path] = self.sources[remap[key]][0].replace("/", "\\")
+
+        self.duplicates = [self.sources[key][0] for key in remap]
+        for key in remap:
+            del self.sources[key]
+
+    def _write_json(self, archive: ZipFile) -> None:
+        # The JSON layout is owned by the modpack, it's written to a scratch folder with no mod files to copy.
+        with tempfile.TemporaryDirectory(prefix="modpack_json_", ignore_cleanup_errors=True) as json_dir:
+            json_path = Path(json_dir)
+            self.pmp.to_folder(json_path, {})
+            for file in sorted(json_path.glob("*.json")):
+                archive.writestr(file.name, file.read_bytes())
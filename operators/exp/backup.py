@@ -0,0 +1,141 @@
+import os
+import json
+import hashlib
+
+from typing   import Iterable
+from pathlib  import Path
+from zipfile  import ZipFile, ZipInfo
+from datetime import datetime
+
+from .archive import CHUNK_SIZE, append_member, read_member
+
+
+BACKUP_FOLDER = "BACKUP"
+
+def _blob_digest(source: ZipFile, info: ZipInfo) -> str:
+    """Hashes the compressed bytes, the header fields are included since the blob is restored as is."""
+    hasher = hashlib.blake2b(f"{info.compress_type}:{info.CRC}:{info.file_size}".encode(), digest_size=16)
+    for chunk in read_member(source, info):
+        hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+def _read_blob(blob: Path) -> Iterable[bytes]:
+    with open(blob, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            yield chunk
+
+
+class BackupStore:
+    """
+    Content addressed backups of modpack archives.
+    Each backup is a manifest of its members, member data is stored once as its compressed bytes and shared by every backup that contains it.
+    Restoring a backup writes the blobs back into an archive without recompressing them.
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.blobs  = folder / "blobs"
+
+    def backup(self, source: Path) -> Path:
+        """Only members that aren't in the store yet are written."""
+        self.blobs.mkdir(parents=True, exist_ok=True)
+
+        members = []
+        with ZipFile(source, "r") as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+
+                digest = _blob_digest(archive, info)
+                blob   = self._blob_path(digest)
+                if not blob.is_file():
+                    blob.parent.mkdir(exist_ok=True)
+                    temp_blob = blob.with_suffix(".tmp")
+                    with open(temp_blob, "wb") as file:
+                        for chunk in read_member(archive, info):
+                            file.write(chunk)
+                    os.replace(temp_blob, blob)
+
+                members.append([
+                    info.filename,
+                    digest,
+                    info.compress_type,
+                    info.CRC,
+                    info.file_size,
+                    info.compress_size,
+                    list(info.date_time),
+                    info.external_attr,
+                    ])
+
+        manifest_path = self.folder / f"{datetime.now().strftime('%Y-%m-%d - %H%M%S')}.json"
+        temp_path     = manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"source": source.name, "members": members}, file)
+        os.replace(temp_path, manifest_path)
+
+        return manifest_path
+
+    def restore(self, manifest_path: Path, output_dir: Path) -> Path:
+        """Rebuilds the archive next to the live modpack instead of replacing it."""
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+
+        output      = output_dir / f"{Path(manifest['source']).stem} - {manifest_path.stem}.pmp"
+        temp_output = output.with_name(f"{output.name}.tmp")
+        try:
+            with ZipFile(temp_output, "w") as archive:
+                for name, digest, compress_type, crc, file_size, compress_size, date_time, external_attr in manifest["members"]:
+                    blob = self._blob_path(digest)
+                    if not blob.is_file():
+                        raise FileNotFoundError(f"Backup is missing data for {name}.")
+
+                    member               = ZipInfo(name, tuple(date_time))
+                    member.compress_type = compress_type
+                    member.CRC           = crc
+                    member.file_size     = file_size
+                    member.compress_size = compress_size
+                    member.external_attr = external_attr
+                    append_member(archive, member, _read_blob(blob))
+
+            os.replace(temp_output, output)
+        finally:
+            temp_output.unlink(missing_ok=True)
+
+        return output
+
+    def prune(self, count: int, max_size: int=0) -> None:
+        """
+        Keeps the newest backups up to the count, and while their shared blobs fit in max_size if it's set.
+        The newest backup is always kept. Blobs no longer referenced by any backup are deleted.
+        """
+        manifests = sorted(self.folder.glob("*.json"), reverse=True)
+
+        kept   : list[Path] = []
+        digests: set[str]   = set()
+        size   : int        = 0
+        for manifest_path in manifests:
+            if len(kept) >= max(count, 1):
+                break
+
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                new_digests = {member[1] for member in json.load(file)["members"]} - digests
+
+            new_size = sum(self._blob_path(digest).stat().st_size for digest in new_digests if self._blob_path(digest).is_file())
+            if kept and max_size and size + new_size > max_size:
+                break
+
+            kept.append(manifest_path)
+            digests |= new_digests
+            size    += new_size
+
+        for manifest_path in manifests:
+            if manifest_path not in kept:
+                manifest_path.unlink()
+
+        for blob in self.blobs.glob("*/*"):
+            if blob.name not in digests:
+                blob.unlink()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs / digest[:2] / digest
@@ -0,0 +1,223 @@
+import os
+import bpy
+import json
+import queue
+import platform
+import threading
+import subprocess
+
+from pathlib       import Path
+from collections   import deque
+
+from .manifest     import ExportManifest
+from ...io.logging import YetAnotherLogger
+
+
+WORKER_TAG = "YA_BATCH_ITEM"
+ERROR_TAG  = "YA_BATCH_ERROR"
+
+# Options apply_model_state writes on every item whether they're set or not, and Clawsies, which only switches collections on.
+# A reset doesn't touch the collections, so it isn't needed for them. Any other difference between two items requires one.
+TOGGLE_OPTIONS = ("Buff", "Rue", "Rue Legs", "Small Butt", "Rue Hands", "Lava Hands", "Rue Feet", "Clawsies")
+
+def _gray_rank(mask: int) -> int:
+    """Position of a bitmask in the reflected Gray code sequence."""
+    rank  = mask
+    shift = mask >> 1
+    while shift:
+        rank  ^= shift
+        shift >>= 1
+    return rank
+
+def state_group(item: tuple) -> tuple:
+    """Items in the same group only differ in options that can be toggled without a reset."""
+    name, options, size, gen = item
+    return size, gen, tuple(sorted(option for option in options if option not in TOGGLE_OPTIONS))
+
+def schedule_queue(items: list[tuple]) -> list[tuple]:
+    """
+    Orders the queue so consecutive items differ by as few options as possible.
+    Items are grouped by size, genitalia and body, each group is walked in Gray code order over its options.
+    Options that change which shape keys the exporter keeps are placed in the high bits so they flip the least.
+    """
+    groups: dict[tuple, list[tuple]] = {}
+    for item in items:
+        groups.setdefault(state_group(item), []).append(item)
+
+    scheduled = []
+    for group in groups.values():
+        universe = sorted({option for item in group for option in item[1]}, key=lambda option: ("Rue" in option or option == "Buff", option))
+        bits     = {option: 1 << idx for idx, option in enumerate(universe)}
+        group.sort(key=lambda item: _gray_rank(sum(bits[option] for option in set(item[1]))))
+        scheduled.extend(group)
+
+    return scheduled
+
+def physical_cores() -> int:
+    try:
+        import psutil
+        return psutil.cpu_count(logical=False) or 1
+    except ImportError:
+        pass
+
+    # Without psutil we assume SMT, which is the norm on desktop CPUs.
+    return max(1, (os.cpu_count() or 1) // 2)
+
+def worker_count(setting: int) -> int:
+    """0 uses the physical core count minus one, leaving a core for the UI session."""
+    if setting > 0:
+        return setting
+    return max(1, physical_cores() - 1)
+
+def split_queue(items: list, shards: int) -> list[list]:
+    """Contiguous shards, neighbouring items share most of their model state."""
+    shards = max(1, min(shards, len(items)))
+    size, extra = divmod(len(items), shards)
+
+    split = []
+    start = 0
+    for idx in range(shards):
+        end = start + size + (1 if idx < extra else 0)
+        split.append(items[start:end])
+        start = end
+
+    return split
+
+def _queue_item(item: list) -> tuple[str, tuple[str, ...], str, str]:
+    name, options, size, gen = item
+    return name, tuple(options), size, gen
+
+def read_shard(file_path: Path) -> dict:
+    with open(file_path, "r", encoding="utf-8") as file:
+        shard = json.load(file)
+
+    shard["queue"]     = [(idx, _queue_item(item)) for idx, item in shard["queue"]]
+    shard["leg_queue"] = [_queue_item(item) for item in shard["leg_queue"]]
+    return shard
+
+def report_item(idx: int, stats: dict[str, list[str]], records: list[tuple[str, str]]) -> None:
+    """Called by workers after each finished queue item, the parent reads it from stdout."""
+    print(f"{WORKER_TAG} {json.dumps({'idx': idx, 'stats': stats, 'records': records})}", flush=True)
+
+def report_error(message: str) -> None:
+    """Errors that a retry can't fix, the parent stops the batch instead of relaunching the worker."""
+    print(f"{ERROR_TAG} {message}", flush=True)
+
+
+class BatchWorkers:
+    """
+    Runs a batch export queue across background Blender processes.
+    Each worker opens a snapshot of the current file and exports a contiguous shard of the queue with the regular batch logic.
+    Workers that fail have their unfinished items relaunched until they run out of retries.
+    """
+
+    def __init__(self, settings: dict, items: list[tuple], workers: int, logger: YetAnotherLogger=None, manifest: ExportManifest=None, retries: int=2):
+        self.settings = settings
+        self.items    = items
+        self.workers  = workers
+        self.logger   = logger
+        self.manifest = manifest
+        self.retries  = retries
+
+        self.messages  : queue.Queue = queue.Queue()
+        self.stats     : dict[str, list[str]] = {}
+        self.finished  : set[int] = set()
+        self.launches  = 0
+        self.error     : str | None = None
+
+    def run(self, temp_dir: Path) -> dict[str, list[str]]:
+        """Blocks until every item is exported. Returns the stats of the last reported item."""
+        snapshot = temp_dir / "batch_snapshot.blend"
+        bpy.ops.wm.save_as_mainfile(filepath=str(snapshot), copy=True, check_existing=False)
+
+        indexed = list(enumerate(self.items))
+        running: dict[int, tuple[subprocess.Popen, list, int, deque]] = {}
+        for shard in split_queue(indexed, self.workers):
+            self._launch(running, snapshot, temp_dir, shard, attempt=0)
+
+        while running:
+            worker_id, line = self.messages.get()
+            if line is not None:
+                self._read_line(running[worker_id][3], line)
+                continue
+
+            process, shard, attempt, output = running.pop(worker_id)
+            process.wait()
+
+            remaining = [entry for entry in shard if entry[0] not in self.finished]
+            if not remaining:
+                continue
+            if self.error:
+                for proc, *_ in running.values():
+                    proc.kill()
+                raise RuntimeError(f"Batch worker failed: {self.error}")
+            if attempt >= self.retries:
+                for proc, *_ in running.values():
+                    proc.kill()
+                raise RuntimeError(f"Batch worker failed after {attempt + 1} attempts:\n" + "".join(output))
+
+            if self.logger:
+                self.logger.log(f"Worker failed, retrying {len(remaining)} items...", 2)
+            self._launch(running, snapshot, temp_dir, remaining, attempt + 1)
+
+        return self.stats
+
+    def _launch(self, running: dict, snapshot: Path, temp_dir: Path, shard: list, attempt: int) -> None:
+        worker_id       = self.launches
+        self.launches  += 1
+        shard_path      = temp_dir / f"shard_{worker_id}.json"
+        with open(shard_path, "w", encoding="utf-8") as file:
+            json.dump({**self.settings, "queue": shard}, file)
+
+        # The devkit registers its properties from a script inside the .blend, it only runs with auto execution enabled.
+        # The flag is only passed along when the user already allows it, workers never bypass that preference.
+        autoexec = ["--enable-autoexec"] if bpy.context.preferences.filepaths.use_scripts_auto_execute else []
+        expr     = f"import bpy; bpy.ops.ya.export('EXEC_DEFAULT', mode='BATCH', shard={str(shard_path)!r})"
+        command  = [
+            bpy.app.binary_path,
+            "--background",
+            *autoexec, str(snapshot),
+            "--python-exit-code", "1",
+            "--python-expr", expr
+            ]
+
+        flags   = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    creationflags=flags
+                    )
+
+        running[worker_id] = (process, shard, attempt, deque(maxlen=30))
+        threading.Thread(target=self._read_output, args=(worker_id, process), daemon=True).start()
+
+    def _read_output(self, worker_id: int, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            self.messages.put((worker_id, line))
+        self.messages.put((worker_id, None))
+
+    def _read_line(self, output: deque, line: str) -> None:
+        if line.startswith(ERROR_TAG):
+            self.error = line[len(ERROR_TAG):].strip()
+            return
+        if not line.startswith(WORKER_TAG):
+            output.append(line)
+            return
+
+        report = json.loads(line[len(WORKER_TAG):])
+        if report["idx"] in self.finished:
+            return
+
+        self.finished.add(report["idx"])
+        if self.manifest:
+            self.manifest.add_records(report["records"])
+        if report["stats"]:
+            self.stats = report["stats"]
+
+        if self.logger:
+            self.logger.log_progress(operation="Exporting files", clear_messages=True)
+            self.logger.log(f"Exported: {self.items[report['idx']][0]}", 2)
@@ -0,0 +1,202 @@
+import os
+import bpy
+import json
+import shutil
+import hashlib
+import numpy as np
+
+from pathlib         import Path
+from numpy           import single, intc
+from bpy.types       import Object
+
+from ...props        import get_window_props, get_studio_props
+from ...mesh.weights import read_group_weights
+
+
+MANIFEST_NAME = "yet_another_manifest.json"
+FILE_SUFFIX   = {'MDL': ".mdl", 'FBX': ".fbx", 'GLTF': ".gltf"}
+
+# Shape keys the SceneHandler reads to decide which shape keys and vertex groups are kept.
+HANDLER_KEYS  = ("Rue", "Buff", "Gen B", "Gen C")
+
+def _hash_array(hasher, collection, attr: str, count: int, dtype) -> None:
+    values = np.zeros(count, dtype=dtype)
+    collection.foreach_get(attr, values)
+    hasher.update(values.tobytes())
+
+def mesh_signature(obj: Object) -> tuple:
+    """Cheap to read, a cached mesh digest is only trusted while it matches."""
+    mesh = obj.data
+    keys = len(mesh.shape_keys.key_blocks) if mesh.shape_keys else 0
+    return mesh.name, len(mesh.vertices), len(mesh.loops), keys, len(obj.vertex_groups)
+
+def mesh_digest(obj: Object) -> str:
+    """Hashes the data of a source mesh that batch items don't change, see state_digest for the rest."""
+    mesh   = obj.data
+    hasher = hashlib.blake2b(digest_size=16)
+    verts  = len(mesh.vertices)
+    loops  = len(mesh.loops)
+
+    _hash_array(hasher, mesh.vertices, "co", verts * 3, single)
+    _hash_array(hasher, mesh.loops, "vertex_index", loops, intc)
+    _hash_array(hasher, mesh.loops, "normal", loops * 3, single)
+    _hash_array(hasher, mesh.polygons, "loop_total", len(mesh.polygons), intc)
+    _hash_array(hasher, mesh.polygons, "material_index", len(mesh.polygons), intc)
+
+    for layer in mesh.uv_layers:
+        hasher.update(layer.name.encode())
+        _hash_array(hasher, layer.uv, "vector", loops * 2, single)
+
+    for layer in mesh.color_attributes:
+        hasher.update(layer.name.encode())
+        count = verts if layer.domain == 'POINT' else loops
+        _hash_array(hasher, layer.data, "color", count * 4, single)
+
+    if mesh.shape_keys:
+        for key in mesh.shape_keys.key_blocks:
+            hasher.update(f"{key.name}:{key.relative_key.name}:{key.vertex_group}".encode())
+            _hash_array(hasher, key.data, "co", verts * 3, single)
+
+    # Blender has no bulk accessor for vertex group memberships, the sparse reader does it in one sweep.
+    for values in read_group_weights(obj, range(len(obj.vertex_groups))):
+        hasher.update(values.tobytes())
+    hasher.update(repr([group.name for group in obj.vertex_groups]).encode())
+
+    return hasher.hexdigest()
+
+def state_digest(obj: Object) -> str:
+    """Hashes what batch items can change on a source mesh, the shape key values, modifiers, transforms and pose."""
+    hasher = hashlib.blake2b(digest_size=16)
+    if obj.data.shape_keys:
+        key_blocks = obj.data.shape_keys.key_blocks
+        count      = len(key_blocks)
+        _hash_array(hasher, key_blocks, "value", count, single)
+        _hash_array(hasher, key_blocks, "slider_min", count, single)
+        _hash_array(hasher, key_blocks, "slider_max", count, single)
+        _hash_array(hasher, key_blocks, "mute", count, bool)
+        
+        handler_keys = [key.name for key in key_blocks if key.name in HANDLER_KEYS and not key.mute and key.value == 1]
+        hasher.update(repr(handler_keys).encode())
+
+    hasher.update(repr([slot.name for slot in obj.material_slots]).encode())
+    hasher.update(repr([(mod.name, mod.type, mod.show_viewport) for mod in obj.modifiers]).encode())
+    hasher.update(repr(sorted((key, str(obj[key])) for key in obj.keys() if key.startswith("xiv"))).encode())
+    hasher.update(np.array(obj.matrix_world, dtype=single).tobytes())
+
+    if obj.parent and obj.parent.type == 'ARMATURE':
+        armature = obj.parent
+        bones    = [(bone.name, tuple(bone.head_local), tuple(bone.tail_local)) for bone in armature.data.bones]
+        hasher.update(repr(bones).encode())
+        hasher.update(repr(armature.data.pose_position).encode())
+        hasher.update(np.array(armature.matrix_world, dtype=single).tobytes())
+        _hash_array(hasher, armature.pose.bones, "matrix", len(armature.pose.bones) * 16, single)
+
+    return hasher.hexdigest()
+
+def export_settings(file_format: str) -> dict:
+    window = get_window_props()
+    model  = get_studio_props().model
+
+    return {
+        "version" : list(bpy.types.Scene.ya_addon_ver),
+        "format"  : file_format,
+        "window"  : [window.keep_shapekeys, window.create_backfaces, window.check_tris, window.light_copies, window.shared_topology],
+        "yas"     : window.file.io.remove_yas,
+        "weights" : [window.file.io.quantise_weights, window.file.io.weight_grid],
+        "flags"   : model.get_flags(),
+        "lods"    : model.use_lods,
+        "neck"    : model.neck_morph,
+        "tangents": model.tangents,
+        "meshes"  : [(str(mesh.material), str(mesh.flow)) for mesh in model.meshes],
+    }
+
+
+class ExportManifest:
+    """
+    Records the input fingerprint of each batch export output in the export folder.
+    Outputs whose fingerprint hasn't changed are skipped, which also lets interrupted batches resume where they stopped.
+    Items with the same fingerprint produce identical files and are copied instead of exported.
+    Read only manifests are used by batch workers, they leave the records to the parent session.
+    """
+
+    def __init__(self, export_dir: Path, file_format: str, read_only=False):
+        self.file_path  = export_dir / MANIFEST_NAME
+        self.export_dir = export_dir
+        self.suffix     = FILE_SUFFIX[file_format]
+        self.settings   = json.dumps(export_settings(file_format), sort_keys=True)
+        self.read_only  = read_only
+
+        self.digests: dict[str, tuple[tuple, str]] = {}
+        self.pending: list[tuple[str, str]] = []
+        self.entries: dict[str, str] = {}
+
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                self.entries = json.load(file).get("entries", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def fingerprint(self, objects: list[Object]) -> str:
+        """Expects the model state of the item to be applied."""
+        hasher = hashlib.blake2b(self.settings.encode(), digest_size=16)
+        for obj in objects:
+            # The mesh data is hashed once per run, the key coordinates and the values decide the shape mix between them.
+            signature = mesh_signature(obj)
+            cached    = self.digests.get(obj.name)
+            if cached is None or cached[0] != signature:
+                cached = (signature, mesh_digest(obj))
+                self.digests[obj.name] = cached
+
+            hasher.update(f"{obj.name}:{cached[1]}:{state_digest(obj)}".encode())
+
+        return hasher.hexdigest()
+
+    def output(self, file_path: Path) -> tuple[str, Path]:
+        output = Path(str(file_path) + self.suffix)
+        return output.relative_to(self.export_dir).as_posix(), output
+
+    def is_current(self, file_path: Path, fingerprint: str) -> bool:
+        key, output = self.output(file_path)
+        return self.entries.get(key) == fingerprint and output.is_file()
+
+    def copy_identical(self, file_path: Path, fingerprint: str) -> bool:
+        """Copies an existing output with the same fingerprint. Only single file formats are copied."""
+        if self.suffix == ".gltf":
+            return False
+
+        key, output = self.output(file_path)
+        for other_key, other_fingerprint in self.entries.items():
+            source = self.export_dir / other_key
+            if other_key == key or other_fingerprint != fingerprint or not source.is_file():
+                continue
+
+            shutil.copy2(source, output)
+            self.record(file_path, fingerprint)
+            return True
+
+        return False
+
+    def record(self, file_path: Path, fingerprint: str) -> None:
+        key, _ = self.output(file_path)
+        self.entries[key] = fingerprint
+        if self.read_only:
+            self.pending.append((key, fingerprint))
+        else:
+            self.save()
+
+    def take_pending(self) -> list[tuple[str, str]]:
+        pending      = self.pending
+        self.pending = []
+        return pending
+
+    def add_records(self, records: list[tuple[str, str]]) -> None:
+        for key, fingerprint in records:
+            self.entries[key] = fingerprint
+        if records:
+            self.save()
+
+    def save(self) -> None:
+        temp_path = self.file_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"entries": self.entries}, file, indent=1)
+        os.replace(temp_path, self.file_path)
@@ -13,13 +13,54 @@ from ...ui.draw      import aligned_row, show_ui_button
 from ...io.logging   import YetAnotherLogger
 from ...xivpy.pmp    import Modpack, sanitise_path
 from ...preferences  import get_prefs
-from ...mesh.export  import check_triangulation, get_export_path, export_result, get_export_stats
+from .batch         import BatchWorkers, worker_count, read_shard, report_item, report_error, schedule_queue, state_group
+from .manifest      import ExportManifest
+from ...io.model     import VariantCache
+from ...mesh.export  import check_triangulation, get_export_path, export_result, get_export_stats, take_export_stats, set_export_stats
 from ...mesh.objects import visible_meshobj
 
 
 _yab_keys : dict[str, float] = {}
 _lava_keys: dict[str, float] = {}
 
+# Tracks the last applied state group per body slot so batch items only apply what changed.
+_state_groups  : dict[str, tuple] = {}
+_skipped_states: int              = 0
+
+def set_state(props, attr: str, value) -> None:
+    """Only assigns changed values, every assignment runs the devkit's update callbacks."""
+    global _skipped_states
+    if getattr(props, attr) == value:
+        _skipped_states += 1
+    else:
+        setattr(props, attr, value)
+
+def set_key_value(obj: Object, key_name: str, value: float) -> None:
+    global _skipped_states
+    key = obj.data.shape_keys.key_blocks[key_name]
+    if key.value == value:
+        _skipped_states += 1
+    else:
+        key.value = value
+
+def reset_state_group(body_slot: str, group: tuple) -> None:
+    """Items in the same state group only differ in options that apply_model_state sets either way."""
+    global _skipped_states
+    if _state_groups.get(body_slot) == group:
+        _skipped_states += 1
+        return
+    
+    reset_model_state(body_slot)
+    _state_groups[body_slot] = group
+
+def clear_state_tracking() -> int:
+    """Returns the number of skipped state updates since the last call."""
+    global _state_groups, _skipped_states
+    skipped         = _skipped_states
+    _state_groups   = {}
+    _skipped_states = 0
+    return skipped
+
 def save_chest_sizes() -> None:
     global _yab_keys, _lava_keys
     devkit_props = get_devkit_props()
@@ -101,18 +142,18 @@ def hand_feet_collection(body_slot: str, options: tuple, size: str) -> None:
 
     if body_slot == "Hands":
         if size in ("Straight", "Curved"):
-            collections.clawsies = True
+            set_state(collections, "clawsies", True)
 
         else:
-            collections.nails = True
-            collections.practical = True
+            set_state(collections, "nails", True)
+            set_state(collections, "practical", True)
     
     if body_slot == "Feet":
         if "Clawsies" in options:
-            collections.toe_clawsies = True
+            set_state(collections, "toe_clawsies", True)
             
         else:
-            collections.toenails = True
+            set_state(collections, "toenails", True)
 
 def apply_model_state(options: tuple[str, ...], size:str , gen: str, body_slot: str) -> None:
     global _yab_keys, _lava_keys
@@ -140,10 +181,10 @@ def apply_model_state(options: tuple[str, ...], size:str , gen: str, body_slot:
             if option in leg_options:
                 leg_size = option
 
-        devkit.leg_state.gen        = gen_to_value[gen]
-        devkit.leg_state.leg_size   = legs_to_value[leg_size]
-        devkit.leg_state.rue        = "Rue Legs" in options
-        devkit.leg_state.small_butt = "Small Butt" in options
+        set_state(devkit.leg_state, "gen",        gen_to_value[gen])
+        set_state(devkit.leg_state, "leg_size",   legs_to_value[leg_size])
+        set_state(devkit.leg_state, "rue",        "Rue Legs" in options)
+        set_state(devkit.leg_state, "small_butt", "Small Butt" in options)
         
     elif body_slot == "Hands":
         hands_to_value = {
@@ -166,12 +207,12 @@ def apply_model_state(options: tuple[str, ...], size:str , gen: str, body_slot:
             if option in hands_to_value:
                 hands = option
 
-        devkit.hand_state.hand_size = '0' if hands is None else hands_to_value[option]
-        devkit.hand_state.nails     = '0' if size not in nails_to_value else nails_to_value[size]
-        devkit.hand_state.clawsies  = '0' if size not in claws_to_value else claws_to_value[size]
+        set_state(devkit.hand_state, "hand_size", '0' if hands is None else hands_to_value[option])
+        set_state(devkit.hand_state, "nails",     '0' if size not in nails_to_value else nails_to_value[size])
+        set_state(devkit.hand_state, "clawsies",  '0' if size not in claws_to_value else claws_to_value[size])
         
     elif body_slot == "Feet":
-        devkit.feet_state.rue_feet = "Rue Feet" in options
+        set_state(devkit.feet_state, "rue_feet", "Rue Feet" in options)
 
     elif body_slot == "Chest":
         chest_to_value = {
@@ -182,10 +223,10 @@ def apply_model_state(options: tuple[str, ...], size:str , gen: str, body_slot:
         }
         category = devkit.ALL_SHAPES[size][2]
 
-        devkit.torso_state.chest_size = chest_to_value[category]
-        devkit.torso_state.buff       = "Buff" in options
-        devkit.torso_state.rue        = "Rue" in options
-        devkit.torso_state.lavabod    = "Lava" in options
+        set_state(devkit.torso_state, "chest_size", chest_to_value[category])
+        set_state(devkit.torso_state, "buff",       "Buff" in options)
+        set_state(devkit.torso_state, "rue",        "Rue" in options)
+        set_state(devkit.torso_state, "lavabod",    "Lava" in options)
 
         if devkit.torso_state.lavabod:
             saved_sizes = _lava_keys
@@ -209,7 +250,7 @@ def apply_model_state(options: tuple[str, ...], size:str , gen: str, body_slot:
             del preset[key]
         
         for key_name, value in preset.items():
-            devkit.yam_torso.data.shape_keys.key_blocks[key_name].value = value
+            set_key_value(devkit.yam_torso, key_name, value)
                 
 def reset_model_state(body_slot: str) -> None:
     devkit  = get_devkit_props()
@@ -260,6 +301,7 @@ class YetAnotherExport(Operator):
     user_input: StringProperty(name="File Name", default="", options={'HIDDEN'}) # type: ignore
 
     mode        : StringProperty(name="", default="SIMPLE", options={'HIDDEN', "SKIP_SAVE"}) # type: ignore
+    shard       : StringProperty(name="", default="", options={'HIDDEN', "SKIP_SAVE"}) # type: ignore
     show_objs   : BoolProperty(
                     name="",
                     description="", 
@@ -322,6 +364,9 @@ class YetAnotherExport(Operator):
         return self.penum_folder.is_dir() and not check_mod_tag(self.penum_folder)
 
     def execute(self, context):
+        if self.shard:
+            return self.shard_export()
+        
         if self.no_armature:
             armature = get_file_props().export_armature
             if not armature:
@@ -503,16 +548,68 @@ class YetAnotherExport(Operator):
             self.report({'ERROR'}, "No valid combinations!")
             return {'CANCELLED'} 
         
+        self.queue     = schedule_queue(self.queue)
+        self.leg_queue = schedule_queue(self.leg_queue)
+        
+        self.piercings    = self.size_options["Piercings"]
+        self.pubes        = self.size_options["Pubes"]
+        self.logger.total = len(self.queue)
+        self.manifest     = ExportManifest(self.export_dir, self.file_format) if self.window.skip_unchanged else None
+
+        workers = worker_count(get_prefs().export.batch_workers)
+        if workers > 1 and len(self.queue) > 1:
+            self._worker_export(workers)
+        else:
+            self._run_queue(list(enumerate(self.queue)))
+    
+    def _worker_export(self, workers: int) -> None:
+        settings = {
+            "export_dir" : str(self.export_dir),
+            "file_format": self.file_format,
+            "body_slot"  : self.body_slot,
+            "piercings"  : self.piercings,
+            "pubes"      : self.pubes,
+            "leg_queue"  : self.leg_queue,
+            "manifest"   : self.manifest is not None,
+        }
+
+        self.logger.log(f"Starting {workers} export workers...", 2)
+        with tempfile.TemporaryDirectory(prefix=f"_batch_blender_", ignore_cleanup_errors=True) as temp_dir:
+            workers      = BatchWorkers(settings, self.queue, workers, logger=self.logger, manifest=self.manifest)
+            export_stats = workers.run(Path(temp_dir))
+
+        set_export_stats(export_stats)
+
+    def shard_export(self) -> set[str]:
+        """Entry point for background batch workers, see BatchWorkers."""
+        shard = read_shard(Path(self.shard))
+        if not get_devkit_props():
+            report_error("The devkit properties aren't registered in the worker. Batch workers need Auto Run Python Scripts enabled, or set Workers to 1.")
+            return {'CANCELLED'}
+
+        self.window      = get_window_props()
+        self.file_format = shard["file_format"]
+        self.export_dir  = Path(shard["export_dir"])
+        self.body_slot   = shard["body_slot"]
+        self.piercings   = shard["piercings"]
+        self.pubes       = shard["pubes"]
+        self.leg_queue   = shard["leg_queue"]
+        self.logger      = YetAnotherLogger(total=len(shard["queue"]))
+        self.manifest    = ExportManifest(self.export_dir, self.file_format, read_only=True) if shard["manifest"] else None
+
+        self._run_queue(shard["queue"], report=True)
+        return {'FINISHED'}
+
+    def _run_queue(self, queue: list[tuple[int, tuple]], report=False) -> None:
+        self.variants = VariantCache(self.logger) if self.window.shared_topology else None
+        self.leg_pass = False
+
         save_chest_sizes()
-        get_devkit_props().export_state(
-            self.body_slot, 
-            self.size_options["Piercings"], 
-            self.size_options["Pubes"]
-            )
+        get_devkit_props().export_state(self.body_slot, self.piercings, self.pubes)
+        clear_state_tracking()
 
         try:
-            self.logger.total = len(self.queue)
-            for item in self.queue:
+            for idx, item in queue:
                 self.logger.log_progress(operation="Exporting files", clear_messages=True)
                 self.logger.log_separator()
                 self.logger.log(f"Size: {item[0]}")
@@ -520,8 +617,17 @@ class YetAnotherExport(Operator):
                 self.logger.log("Applying sizes...", 2)
 
                 self._process_queue(item, self.body_slot, leg_queue=self.leg_queue)
+
+                if report:
+                    records = self.manifest.take_pending() if self.manifest else []
+                    report_item(idx, take_export_stats(), records)
         
+            self.logger.log(f"Skipped {clear_state_tracking()} redundant model state updates.", 2)
+
         finally:
+            clear_state_tracking()
+            if self.variants:
+                self.variants.clear()
             reset_chest_values()
             get_devkit_props().collection_state.export = False
             bpy.context.view_layer.update()
@@ -719,7 +825,7 @@ class YetAnotherExport(Operator):
         
         hand_feet_collection(body_slot, options, size)
         
-        reset_model_state(body_slot)
+        reset_state_group(body_slot, state_group(item))
         apply_model_state(options, size, gen, body_slot)
         
         if leg_queue:
@@ -759,8 +865,12 @@ class YetAnotherExport(Operator):
         
             return True
 
+        # Alternating the leg order means the first leg item matches the state left by the previous torso item.
+        self.leg_pass = not self.leg_pass
+        leg_queue     = self.leg_queue if self.leg_pass else reversed(self.leg_queue)
+
         exported = set()
-        for leg_task in self.leg_queue:
+        for leg_task in leg_queue:
             combined_name = torso_name + " - " + leg_task[0]
             final_name = clean_file_name(combined_name)
 
@@ -772,8 +882,21 @@ class YetAnotherExport(Operator):
                     exported.add(final_name)
 
     def _export_item(self, file_name: str):
-        file_path = get_export_path(self.export_dir, file_name, self.window.create_subfolder, self.body_slot)
-        export_result(file_path, self.file_format, logger=self.logger, batch=True)
+        file_path   = get_export_path(self.export_dir, file_name, self.window.create_subfolder, self.body_slot)
+        fingerprint = self.manifest.fingerprint(visible_meshobj()) if self.manifest else None
+
+        if fingerprint and self.manifest.is_current(file_path, fingerprint):
+            self.logger.log(f"{file_name}: Unchanged, skipped.", 2)
+            return
+        
+        if fingerprint and self.manifest.copy_identical(file_path, fingerprint):
+            self.logger.log(f"{file_name}: Identical to a previous export, copied.", 2)
+            return
+        
+        export_result(file_path, self.file_format, logger=self.logger, batch=True, variants=self.variants)
+
+        if fingerprint:
+            self.manifest.record(file_path, fingerprint)
     
 
 CLASSES = [
@@ -1,19 +1,27 @@
+import os
+import json
 import shutil
+import hashlib
 import tempfile
 
-from pathlib          import Path
-from datetime         import datetime
-from itertools        import chain
-from functools        import singledispatchmethod
-from bpy.types        import Operator, Context, UILayout
-from bpy.props        import StringProperty, IntProperty
+from typing             import TYPE_CHECKING
+from pathlib            import Path
+from itertools          import chain
+from functools          import singledispatchmethod
+from concurrent.futures import ThreadPoolExecutor
+from bpy.types          import Operator, Context, UILayout
+from bpy.props          import StringProperty, IntProperty
 
-from ...props         import get_window_props
-from ...io.model      import ModpackError, ModpackFileError, ModpackGamePathError, ModpackValidationError, ModpackPhybCollisionError, ModpackFolderError
-from ...xivpy.pmp     import *
-from ...xivpy.phyb    import PhybFile
-from ...preferences   import get_prefs
-from ...props.modpack import BlendModGroup, BlendModOption, ModFileEntry, ModMetaEntry, modpack_data, yet_another_sort
+from .backup            import BACKUP_FOLDER, BackupStore
+from .archive           import ModpackArchive, FileHashCache
+from ...props           import get_window_props
+from ...io.model        import ModpackError, ModpackFileError, ModpackGamePathError, ModpackValidationError, ModpackPhybCollisionError, ModpackFolderError
+from ...xivpy.pmp       import *
+from ...preferences     import get_prefs
+from ...props.modpack   import BlendModGroup, BlendModOption, ModFileEntry, ModMetaEntry, modpack_data, get_modpack_metadata, yet_another_sort
+
+if TYPE_CHECKING:
+    from ...xivpy.phyb import PhybFile
 
 
 def get_binary_name(all_options: list, options: set[str]) -> str:
@@ -26,6 +34,21 @@ def get_binary_name(all_options: list, options: set[str]) -> str:
 
     return option_name
 
+def phyb_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def serialise_phybs(phyb: 'PhybFile', sim_sets: list[tuple[tuple[str, ...], list]]) -> dict[tuple[str, ...], tuple[bytes, str]]:
+    """Serialises the phyb once per simulator set. The job owns the phyb, its simulators are swapped between sets and restored after."""
+    base_sims  = list(phyb.simulators)
+    serialised = {}
+    for sim_key, simulators in sim_sets:
+        phyb.simulators     = [*base_sims, *simulators]
+        data                = phyb.to_bytes()
+        serialised[sim_key] = (data, phyb_digest(data))
+
+    phyb.simulators = base_sims
+    return serialised
+
 class ModPackager(Operator):
     bl_idname = "ya.mod_packager"
     bl_label = "Modpacker"
@@ -88,9 +111,11 @@ class ModPackager(Operator):
 
     def create_modpack(self, context: Context) -> int | None:
         if self.update:
-            pmp = Modpack.from_archive(self.pmp_source)  
+            self.metadata = get_modpack_metadata(self.pmp_source)
+            pmp           = self.metadata.modpack()
         else:
-            pmp = Modpack()
+            self.metadata = None
+            pmp           = Modpack()
 
         pmp.meta.Name    = self.pmp_name
         pmp.meta.Author  = self.author
@@ -103,15 +128,20 @@ class ModPackager(Operator):
             self.validate_container(blend_group)
             self.create_group(pmp)   
 
-        with tempfile.TemporaryDirectory(prefix=f"modpack_{self.pmp_name}_", ignore_cleanup_errors=True) as temp_dir:
-            temp_path = Path(temp_dir)
-            if self.update:
-                pmp.extract_archive(self.pmp_source, temp_path)
-                self.rolling_backup()
+        hashes  = FileHashCache(self.output_dir)
+        archive = ModpackArchive(pmp, level=self.prefs.modpack_compression, hashes=hashes)
+        if self.update:
+            self.rolling_backup()
+            archive.add_archive(self.pmp_source)
+
+        for file, relative_path in self.checked_files.items():
+            archive.add_file(file, relative_path)
 
-            orphans, duplicates = pmp.to_folder(temp_path, self.checked_files)
+        archive.write(self.output_dir / f"{self.pmp_name}.pmp")
+        hashes.save()
 
-            pmp.to_archive(temp_path, self.output_dir, self.pmp_name)
+        orphans    = archive.orphans
+        duplicates = archive.duplicates
 
         if (self.output_dir / f"{self.pmp_name}.pmp").is_file():
             self.props.file.modpack.modpack_dir = str(self.output_dir / f"{self.pmp_name}.pmp")
@@ -146,8 +176,11 @@ class ModPackager(Operator):
             mod_group = ModGroup()
             old_group = None
         else:
+            # The UI indexes groups by their file order, the Modpack may hold them in another.
             new_group = False
-            mod_group = pmp.groups[int(self.blend_group.idx)]
+            group_idx = int(self.blend_group.idx)
+            group_idx = self.metadata.modpack_index(group_idx) if self.metadata else group_idx
+            mod_group = pmp.groups[group_idx]
             old_group = mod_group.copy()
 
         mod_group.Name        = self.blend_group.name
@@ -168,7 +201,7 @@ class ModPackager(Operator):
         if int(self.blend_group.page) != mod_group.Page or new_group:
             pmp.update_group_page(int(self.blend_group.page), mod_group, new_group)
         else:
-            pmp.groups[int(self.blend_group.idx)] = mod_group
+            pmp.groups[group_idx] = mod_group
 
     def resolve_option_structure(self, mod_group: ModGroup, old_group: ModGroup=None) -> None:
         combining_group = mod_group.Type == "Combining"
@@ -263,30 +296,65 @@ class ModPackager(Operator):
         temp_dir = Path(tempfile.mkdtemp())
         self.temp_dir.append(temp_dir)
         all_options = [name for name in new_phybs]
+
+        # Options with identical simulators share a key, options without simulators don't add to it.
+        # Combinations with the same simulator set only get serialised once per base.
+        option_keys = {
+            option: phyb_digest(sim_phyb.to_bytes()) 
+            for option, (sim_phyb, category) in new_phybs.items() 
+            if sim_phyb.simulators
+            }
+        
+        combo_keys: dict[int, tuple[str, ...]]      = {}
+        sim_sets  : dict[tuple[str, ...], list[str]] = {}
         for idx, options in enumerate(combinations):
             if idx == 0:
                 continue
             if duplicate_sim_category(options):
                 continue
-            
-            option_name = get_binary_name(all_options, set(options))
-            option_dir  = temp_dir / option_name
-            Path.mkdir(option_dir)
-
-            phyb_copies = {game_path: phyb.copy() for game_path, phyb in base_phybs.items()}
-            new_sims    = [sim for option in options for sim in new_phybs[option][0].simulators]
 
-            for game_path, phyb in phyb_copies.items():
-                file_path = option_dir / Path(game_path).name
+            sim_key = tuple(option_keys[option] for option in options if option in option_keys)
+            combo_keys[idx] = sim_key
+            sim_sets.setdefault(sim_key, options)
 
-                phyb.simulators.extend(new_sims)
-                phyb.to_file(str(file_path))
-
-                container_list[idx].Files[game_path] = self._get_relative_path(file_path, option_name, game_path)
+        # Each base is copied once per job on this thread, never per combination, and no two jobs share a copy.
+        workers  = min(os.cpu_count() or 1, len(sim_sets)) or 1
+        sim_list = [
+            (sim_key, [sim for option in options for sim in new_phybs[option][0].simulators]) 
+            for sim_key, options in sim_sets.items()
+            ]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            jobs = [
+                (game_path, executor.submit(serialise_phybs, base_phyb.copy(), sim_list[idx::workers]))
+                for game_path, base_phyb in base_phybs.items()
+                for idx in range(workers)
+            ]
+            serialised = {
+                (game_path, sim_key): result 
+                for game_path, job in jobs 
+                for sim_key, result in job.result().items()
+                }
+
+        # Identical outputs are stored once, regardless of which base or combination produced them.
+        stored: dict[str, Path] = {}
+        for idx, sim_key in combo_keys.items():
+            option_name = get_binary_name(all_options, set(combinations[idx]))
+            for game_path in base_phybs:
+                data, digest = serialised[(game_path, sim_key)]
+                if digest not in stored:
+                    file_path = temp_dir / digest / Path(game_path).name
+                    file_path.parent.mkdir()
+                    file_path.write_bytes(data)
+                    stored[digest] = file_path
+
+                container_list[idx].Files[game_path] = self._get_relative_path(stored[digest], option_name, game_path)
         
         mod_group.Containers = container_list
 
-    def _get_phybs(self, mod_group: ModGroup, old_group: ModGroup) -> tuple[dict[str, PhybFile], dict[str, tuple[PhybFile, str]]]:
+    def _get_phybs(self, mod_group: ModGroup, old_group: ModGroup) -> tuple[dict[str, 'PhybFile'], dict[str, tuple['PhybFile', str]]]:
+        from ...xivpy.phyb import PhybFile
+
         base_phybs: dict[str, PhybFile]             = {}
         new_phybs : dict[str, tuple[PhybFile, str]] = {}
 
@@ -410,20 +478,45 @@ class ModPackager(Operator):
                     raise ModpackGamePathError(f'Group "{self.blend_group.name}": XIV path is not valid.')
 
     def rolling_backup(self) -> None:
-        folder_bak = self.output_dir / "BACKUP"
-        time = datetime.now().strftime("%Y-%m-%d - %H%M%S")
-        pmp_bak = folder_bak / f"{time}.pmp"
+        store = BackupStore(self.output_dir / BACKUP_FOLDER)
+        store.backup(self.pmp_source)
+        store.prune(self.prefs.modpack_backups, self.prefs.modpack_backup_size * 1024 * 1024)
+
+class ModpackRestore(Operator):
+    bl_idname      = "ya.modpack_restore"
+    bl_label       = "Restore Backup"
+    bl_description = "Rebuilds a modpack from one of its backups. The restored modpack is saved next to the original"
+
+    filepath   : StringProperty(subtype="FILE_PATH") # type: ignore
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'}) # type: ignore
+
+    def invoke(self, context: Context, event):
+        backup_dir = Path(get_prefs().modpack_output_dir) / BACKUP_FOLDER
+        if not backup_dir.is_dir():
+            self.report({'ERROR'}, "No backups found in the output directory.")
+            return {'CANCELLED'}
         
-        Path.mkdir(folder_bak, exist_ok=True)
+        self.filepath = str(backup_dir) + os.sep
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
-        existing_bak = sorted([file for file in folder_bak.glob("*.pmp") if file.is_file()], reverse=True)
-
-        for old_backup in existing_bak[4:]:
-            old_backup.unlink()
-
-        shutil.copy(self.pmp_source, pmp_bak)
+    def execute(self, context: Context):
+        manifest = Path(self.filepath)
+        if not manifest.is_file():
+            self.report({'ERROR'}, "Please select a backup.")
+            return {'CANCELLED'}
+        
+        try:
+            output = BackupStore(manifest.parent).restore(manifest, Path(get_prefs().modpack_output_dir))
+        except (FileNotFoundError, KeyError, ValueError, json.JSONDecodeError) as e:
+            self.report({'ERROR'}, f"Failed to restore backup. {e}")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Restored {output.name}")
+        return {'FINISHED'}
 
 
 CLASSES = [
-    ModPackager
+    ModPackager,
+    ModpackRestore
 ]
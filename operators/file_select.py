@@ -8,11 +8,9 @@ from bpy.props       import StringProperty, IntProperty, EnumProperty, Collectio
 from collections     import defaultdict
 
 from ..props         import get_window_props, get_file_props
-from ..io.model      import ModelImport
-from ..xivpy.pmp     import Modpack
 from ..preferences   import get_prefs
 from ..utils.typings import BlendEnum
-from ..props.modpack import BlendModOption, BlendModGroup, ModFileEntry
+from ..props.modpack import BlendModOption, BlendModGroup, ModFileEntry, ModpackMetadata, get_modpack_metadata
 
 
 class PMPOption(PropertyGroup):
@@ -99,6 +97,8 @@ class FileSelector(Operator):
         return {"RUNNING_MODAL"}
 
     def execute(self, context):
+        from ..io.model import ModelImport
+        
         file = Path(self.filepath)
 
         if not file.is_file():
@@ -133,34 +133,38 @@ class SelectFromPMP(Operator):
     pmp_groups: CollectionProperty(type=PMPGroup) # type: ignore
     
     def invoke(self, context: Context, event):
-        pmp = Modpack.from_archive(Path(self.filepath))
+        metadata = get_modpack_metadata(Path(self.filepath))
+        if metadata is None:
+            self.report({'ERROR'}, "Modpack not found.")
+            return {'CANCELLED'}
+        
         self.mdl_files: dict[str, dict[str, set[str]]] = defaultdict(dict)
-        self.parse_modpack(pmp)
+        self.parse_modpack(metadata)
         
         return context.window_manager.invoke_props_dialog(self, confirm_text="Import")
     
-    def parse_modpack(self, pmp: Modpack):
+    def parse_modpack(self, metadata: ModpackMetadata):
         pmp_groups: list[PMPGroup] = self.pmp_groups
 
         added_groups = 0
-        for group in pmp.groups:
-            options = group.Containers if group.Containers else group.Options or []
+        for group in metadata.groups():
+            options = group.get("Containers") or group.get("Options") or []
 
             mdl_files: dict[str, set[str]] = defaultdict(set)
             for option in options:
-                files = [(key, relative_path) for key, relative_path in (option.Files or {}).items()]
+                files = [(key, relative_path) for key, relative_path in (option.get("Files") or {}).items()]
                 
                 for (key, relative_path) in files:
                     file = Path(relative_path)
                     if file.suffix != ".mdl":
                         continue
 
-                    mdl_files[option.Name].add(relative_path)
+                    mdl_files[option.get("Name") or ""].add(relative_path)
 
             if mdl_files:
                 new_group            = pmp_groups.add()
-                new_group.group_name = group.Name
-                new_group.group_desc = group.Description
+                new_group.group_name = group.get("Name") or ""
+                new_group.group_desc = group.get("Description") or ""
 
                 for option, paths in mdl_files.items():
                     new_file          = new_group.files.add()
@@ -230,15 +234,20 @@ class SelectFromPMP(Operator):
             row.label(icon='INFO', text=f"This option contains {files} models.")
 
     def execute(self, context):
+        from ..io.model import ModelImport
+        
         if len(self.pmp_groups) == 0:
             return {'FINISHED'}
         
-        rel_paths = self.mdl_files[int(self.group)][self.option]
+        metadata = get_modpack_metadata(Path(self.filepath))
+        if metadata is None:
+            self.report({'ERROR'}, "Modpack not found.")
+            return {'CANCELLED'}
+        
+        rel_paths     = self.mdl_files[int(self.group)][self.option]
+        archive_lower = metadata.members
 
         with zipfile.ZipFile(self.filepath, 'r') as zip_file:
-            archive_files = zip_file.namelist()
-            archive_lower = {file.lower(): file for file in archive_files}
-
             for rel_path in rel_paths:
                 normalised_path = rel_path.replace('\\', '/').lower()
                 
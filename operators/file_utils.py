@@ -10,7 +10,6 @@ from bpy.props     import BoolProperty
 from collections   import defaultdict
  
 from ..props       import get_window_props
-from ..xivpy.phyb  import PhybFile
 from ..xivpy.model import XIVModel
 
 
@@ -133,6 +132,8 @@ Prints an error for every simulator that has undefined collision objects in the
 Resulting phyb is written to the same folder as the base phyb"""
 
     def execute(self, context):
+        from ..xivpy.phyb import PhybFile
+
         self.window = get_window_props()
 
         files_exist = Path(self.window.insp_file1).is_file() and Path(self.window.insp_file2).is_file()
@@ -168,6 +169,8 @@ class CompareOutput(Operator):
     bl_description = "Compares an output of the base file with itself. Used to verify roundtrips"
 
     def execute(self, context):
+        from ..xivpy.phyb import PhybFile
+
         self.window = get_window_props()
         original    = Path(self.window.insp_file1)
             
@@ -5,8 +5,7 @@ from bpy.types      import Operator, Object, UILayout
 from bpy.props      import StringProperty, IntProperty, EnumProperty, BoolProperty
 
 from .flow          import default_xiv_flow
-from ..props        import get_studio_props, get_xiv_meshes
-from ..mesh.objects import visible_meshobj
+from ..props        import get_studio_props, get_scene_meshes, SCENE_INDEX
 
 
 class Attributes(Operator):
@@ -75,6 +74,7 @@ class Attributes(Operator):
         else:
             obj[self.attr] = True
         
+        SCENE_INDEX.invalidate(obj)
         for area in context.screen.areas:
             area.tag_redraw()
         return {'FINISHED'}
@@ -204,7 +204,7 @@ class MeshMaterial(Operator):
         layout.prop(self.model_props.meshes[self.mesh], "material", text="")
 
     def execute(self, context):
-        scene_mesh = get_xiv_meshes(visible_meshobj())[self.mesh]
+        scene_mesh = get_scene_meshes()[self.mesh]
         for obj_data in scene_mesh:
             obj = obj_data[0]
             obj["xiv_material"] = self.model_props.meshes[self.mesh].material
@@ -226,7 +226,7 @@ class UpdateFlow(Operator):
         return bpy.context.mode == 'OBJECT'
     
     def execute(self, context):
-        self.objs = get_xiv_meshes(visible_meshobj())[int(self.mesh)]
+        self.objs = get_scene_meshes()[int(self.mesh)]
 
         updated = 0
         for obj, submesh, lod, name, props in self.objs:
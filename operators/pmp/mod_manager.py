@@ -373,9 +373,7 @@ class ModpackPresets(Operator):
         return json.dumps(wrapper)
     
     def sort_presets(self, presets, manager: RNAPropertyIO):
-        data = manager.extract(presets)
-        sorted_presets = sorted(data, key=lambda preset: (preset["format"], preset["name"]))
-        manager.restore(sorted_presets, presets)
+        manager.reorder(presets, lambda preset: (preset.format, preset.name))
 
 
 CLASSES = [
@@ -3,14 +3,200 @@ import bpy
 import json
 import gzip
 import base64
+import numpy as np
 
-from math           import pi
-from pathlib        import Path
-from ..props        import get_studio_props, get_window_props
-from mathutils      import Quaternion
-from bpy.types      import Operator, PoseBone, Context, Modifier
-from bpy.props      import StringProperty, BoolProperty
-from ..mesh.objects import visible_meshobj
+from math               import pi
+from pathlib            import Path
+from ..props            import get_studio_props, get_window_props
+from mathutils          import Quaternion, Matrix
+from bpy.types          import Operator, PoseBone, Context, Object, Bone, Action
+from bpy.props          import StringProperty, BoolProperty, IntProperty
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Descriptive bone names used by older .pose files.
+OLD_BONE_MAP = {
+    "j_asi_e_l": "ToesLeft",
+    "j_asi_d_l": "FootLeft",
+    "j_asi_c_l": "CalfLeft",
+    "j_asi_b_l": "KneeLeft",
+    "j_asi_a_l": "LegLeft",
+    "j_asi_e_r": "ToesRight",
+    "j_asi_d_r": "FootRight",
+    "j_asi_c_r": "CalfRight",
+    "j_asi_b_r": "KneeRight",
+    "j_asi_a_r": "LegRight",
+    "j_ko_b_r": "PinkyBRight",
+    "j_ko_a_r": "PinkyARight",
+    "j_kusu_b_r": "RingBRight",
+    "j_kusu_a_r": "RingARight",
+    "j_naka_b_r": "MiddleBRight",
+    "j_naka_a_r": "MiddleARight",
+    "j_hito_b_r": "IndexBRight",
+    "j_hito_a_r": "IndexARight",
+    "j_oya_b_r": "ThumbBRight",
+    "j_oya_a_r": "ThumbARight",
+    "j_te_r": "HandRight",
+    "n_hte_r": "WristRight",
+    "j_ude_b_r": "ForearmRight",
+    "j_ude_a_r": "ArmRight",
+    "n_hhiji_r": "ElbowRight",
+    "n_hkata_r": "ShoulderRight",
+    "j_ko_b_l": "PinkyBLeft",
+    "j_ko_a_l": "PinkyALeft",
+    "j_kusu_b_l": "RingBLeft",
+    "j_kusu_a_l": "RingALeft",
+    "j_naka_b_l": "MiddleBLeft",
+    "j_naka_a_l": "MiddleALeft",
+    "j_hito_b_l": "IndexBLeft",
+    "j_hito_a_l": "IndexALeft",
+    "j_oya_b_l": "ThumbBLeft",
+    "j_oya_a_l": "ThumbALeft",
+    "j_te_l": "HandLeft",
+    "n_hte_l": "WristLeft",
+    "j_ude_b_l": "ForearmLeft",
+    "j_ude_a_l": "ArmLeft",
+    "n_hhiji_l": "ElbowLeft",
+    "n_hkata_l": "ShoulderLeft",
+    "j_kao": "Head",
+    "j_kubi": "Neck",
+    "j_kosi": "Waist",
+    "j_sebo_a": "SpineA",
+    "j_sebo_b": "SpineB",
+    "j_sebo_c": "SpineC",
+    "j_mune_r": "BreastRight",
+    "j_mune_l": "BreastLeft",
+    "j_sako_r": "ClavicleRight",
+    "j_sako_l": "ClavicleLeft",
+    "n_throw": "Throw",
+    "n_hara": "Root",
+    "j_ago": "Jaw",
+    "j_f_dlip_a": "LipLowerA",
+    "j_f_dlip_b": "LipLowerB",
+    "j_f_ulip_a": "LipUpperA",
+    "j_f_ulip_b": "LipUpperB",
+    "j_f_lip_l": "LipsLeft",
+    "j_f_lip_r": "LipsRight",
+    "j_f_hoho_r": "CheekRight",
+    "j_f_hoho_l": "CheekLeft",
+    "j_f_hana": "Nose",
+    "n_sippo_a": "TailA",
+    "n_sippo_b": "TailB",
+    "n_sippo_c": "TailC",
+    "n_sippo_d": "TailD",
+    "n_sippo_e": "TailE",
+    "j_f_memoto": "Bridge",
+    "j_f_umab_l": "EyelidUpperLeft",
+    "j_f_dmab_l": "EyelidLowerLeft",
+    "j_f_eye_l": "EyeLeft",
+    "j_f_umab_r": "EyelidUpperRight",
+    "j_f_dmab_r": "EyelidLowerRight",
+    "j_f_eye_r": "EyeRight",
+    "j_f_miken_l": "BrowLeft",
+    "j_f_mayu_l": "EyebrowLeft",
+    "j_f_miken_r": "BrowRight",
+    "j_f_mayu_r": "EyebrowRight",
+    "j_mimi_r": "EarRight",
+    "j_mimi_l": "EarLeft",
+    "n_ear_a_l": "EarringALeft",
+    "n_ear_b_l": "EarringBLeft",
+    "n_ear_a_r": "EarringARight",
+    "n_ear_b_r": "EarringBRight"
+    }
+
+def pose_bone_name(bone_name: str, source_bones: dict[str, dict]) -> str | None:
+    """Returns the key of the bone in the .pose file, if it has one."""
+    if bone_name in source_bones:
+        return bone_name
+    old_name = OLD_BONE_MAP.get(bone_name)
+    if old_name in source_bones:
+        return old_name
+    return None
+
+def pose_rotation(rotation_str: str, is_rotated: bool) -> Matrix:
+    """Pose space rotation of a .pose bone entry."""
+    rotation = rotation_str.split(", ")
+    # XYZW to WXYZ
+    rotation = Quaternion((float(rotation[3]), float(rotation[0]), float(rotation[1]), float(rotation[2])))
+    
+    if not is_rotated:
+        # Adjust global space of quaternion
+        rotation = Quaternion((1, 0, 0), pi / 2) @ rotation
+    
+    return rotation.to_matrix()
+
+def local_rotations(armature_obj: Object, targets: dict[str, Matrix]) -> dict[str, Quaternion]:
+    """
+    Converts pose space rotations to local bone rotations without evaluating the armature.
+    Walks the hierarchy top-down, composing the rest matrices with the parent pose rotations.
+    Bones without a target keep their current rotation, which their children inherit.
+    Only rotations are tracked, uniform scaling doesn't change the result.
+    """
+    pose_bones = armature_obj.pose.bones
+    pose_rot: dict[str, Matrix] = {}
+    rotations: dict[str, Quaternion] = {}
+
+    def solve_bone(bone: Bone) -> None:
+        rest = bone.matrix_local.to_3x3().normalized()
+        if bone.parent and bone.use_inherit_rotation:
+            parent_rest = bone.parent.matrix_local.to_3x3().normalized()
+            base = pose_rot[bone.parent.name] @ parent_rest.transposed() @ rest
+        else:
+            base = rest
+        
+        if bone.name in targets:
+            rotations[bone.name] = (base.transposed() @ targets[bone.name]).to_quaternion()
+            pose_rot[bone.name]  = targets[bone.name]
+        else:
+            pose_rot[bone.name]  = base @ pose_bones[bone.name].matrix_basis.to_3x3().normalized()
+
+        for child in bone.children:
+            solve_bone(child)
+
+    for bone in armature_obj.data.bones:
+        if not bone.parent:
+            solve_bone(bone)
+    
+    return rotations
+
+def read_pose_rotations(pose_file: Path) -> dict[str, str] | None:
+    """Returns the rotation string of every bone in the file, None if the file isn't a valid .pose."""
+    try:
+        with open(pose_file, "r") as file:
+            pose = json.load(file)
+        return {name: bone["Rotation"] for name, bone in pose["Bones"].items() if "Rotation" in bone}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+def bake_rotations(armature_obj: Object, bone_keys: dict[str, list[tuple[int, Quaternion]]], name: str) -> Action:
+    """Writes the keyed rotations to a new action, each F-Curve is filled in one call."""
+    action = bpy.data.actions.new(name)
+    if not armature_obj.animation_data:
+        armature_obj.animation_data_create()
+    armature_obj.animation_data.action = action
+
+    for bone_name, keys in bone_keys.items():
+        data_path = f'pose.bones["{bone_name}"].rotation_quaternion'
+        frames    = np.array([frame for frame, _ in keys], dtype=np.float32)
+        values    = np.array([tuple(rotation) for _, rotation in keys], dtype=np.float32)
+
+        # Keeps neighbouring keys in the same hemisphere so they interpolate the short way.
+        signs = np.where(np.sum(values[1:] * values[:-1], axis=1) < 0, -1.0, 1.0)
+        values[1:] *= np.cumprod(signs)[:, None]
+
+        for idx in range(4):
+            if bpy.app.version >= (4, 4, 0):
+                fcurve = action.fcurve_ensure_for_datablock(armature_obj, data_path, index=idx, group_name=bone_name)
+            else:
+                fcurve = action.fcurves.new(data_path, index=idx, action_group=bone_name)
+            
+            fcurve.keyframe_points.add(len(keys))
+            fcurve.keyframe_points.foreach_set("co", np.column_stack((frames, values[:, idx])).ravel())
+            fcurve.update()
+        
+        armature_obj.pose.bones[bone_name].rotation_mode = "QUATERNION"
+    
+    return action
 
 
 class PoseApply(Operator):
@@ -78,94 +264,6 @@ class PoseApply(Operator):
         self.props        = get_studio_props()
         self.window       = get_window_props()
         self.scaling      = self.window.scaling_armature
-        self.old_bone_map = {
-            "j_asi_e_l": "ToesLeft",
-            "j_asi_d_l": "FootLeft",
-            "j_asi_c_l": "CalfLeft",
-            "j_asi_b_l": "KneeLeft",
-            "j_asi_a_l": "LegLeft",
-            "j_asi_e_r": "ToesRight",
-            "j_asi_d_r": "FootRight",
-            "j_asi_c_r": "CalfRight",
-            "j_asi_b_r": "KneeRight",
-            "j_asi_a_r": "LegRight",
-            "j_ko_b_r": "PinkyBRight",
-            "j_ko_a_r": "PinkyARight",
-            "j_kusu_b_r": "RingBRight",
-            "j_kusu_a_r": "RingARight",
-            "j_naka_b_r": "MiddleBRight",
-            "j_naka_a_r": "MiddleARight",
-            "j_hito_b_r": "IndexBRight",
-            "j_hito_a_r": "IndexARight",
-            "j_oya_b_r": "ThumbBRight",
-            "j_oya_a_r": "ThumbARight",
-            "j_te_r": "HandRight",
-            "n_hte_r": "WristRight",
-            "j_ude_b_r": "ForearmRight",
-            "j_ude_a_r": "ArmRight",
-            "n_hhiji_r": "ElbowRight",
-            "n_hkata_r": "ShoulderRight",
-            "j_ko_b_l": "PinkyBLeft",
-            "j_ko_a_l": "PinkyALeft",
-            "j_kusu_b_l": "RingBLeft",
-            "j_kusu_a_l": "RingALeft",
-            "j_naka_b_l": "MiddleBLeft",
-            "j_naka_a_l": "MiddleALeft",
-            "j_hito_b_l": "IndexBLeft",
-            "j_hito_a_l": "IndexALeft",
-            "j_oya_b_l": "ThumbBLeft",
-            "j_oya_a_l": "ThumbALeft",
-            "j_te_l": "HandLeft",
-            "n_hte_l": "WristLeft",
-            "j_ude_b_l": "ForearmLeft",
-            "j_ude_a_l": "ArmLeft",
-            "n_hhiji_l": "ElbowLeft",
-            "n_hkata_l": "ShoulderLeft",
-            "j_kao": "Head",
-            "j_kubi": "Neck",
-            "j_kosi": "Waist",
-            "j_sebo_a": "SpineA",
-            "j_sebo_b": "SpineB",
-            "j_sebo_c": "SpineC",
-            "j_mune_r": "BreastRight",
-            "j_mune_l": "BreastLeft",
-            "j_sako_r": "ClavicleRight",
-            "j_sako_l": "ClavicleLeft",
-            "n_throw": "Throw",
-            "n_hara": "Root",
-            "j_ago": "Jaw",
-            "j_f_dlip_a": "LipLowerA",
-            "j_f_dlip_b": "LipLowerB",
-            "j_f_ulip_a": "LipUpperA",
-            "j_f_ulip_b": "LipUpperB",
-            "j_f_lip_l": "LipsLeft",
-            "j_f_lip_r": "LipsRight",
-            "j_f_hoho_r": "CheekRight",
-            "j_f_hoho_l": "CheekLeft",
-            "j_f_hana": "Nose",
-            "n_sippo_a": "TailA",
-            "n_sippo_b": "TailB",
-            "n_sippo_c": "TailC",
-            "n_sippo_d": "TailD",
-            "n_sippo_e": "TailE",
-            "j_f_memoto": "Bridge",
-            "j_f_umab_l": "EyelidUpperLeft",
-            "j_f_dmab_l": "EyelidLowerLeft",
-            "j_f_eye_l": "EyeLeft",
-            "j_f_umab_r": "EyelidUpperRight",
-            "j_f_dmab_r": "EyelidLowerRight",
-            "j_f_eye_r": "EyeRight",
-            "j_f_miken_l": "BrowLeft",
-            "j_f_mayu_l": "EyebrowLeft",
-            "j_f_miken_r": "BrowRight",
-            "j_f_mayu_r": "EyebrowRight",
-            "j_mimi_r": "EarRight",
-            "j_mimi_l": "EarLeft",
-            "n_ear_a_l": "EarringALeft",
-            "n_ear_b_l": "EarringBLeft",
-            "n_ear_a_r": "EarringARight",
-            "n_ear_b_r": "EarringBRight"
-            }
     
         pose_file         = Path(self.filepath)
         self.armature_obj = self.props.outfit_armature
@@ -235,87 +333,24 @@ class PoseApply(Operator):
                 self.x_rotation = Quaternion((1, 0, 0), pi / 2).to_matrix().to_4x4()
                 self.armature_world = self.armature_obj.matrix_world @ self.x_rotation
 
-            visible_mesh = visible_meshobj()
-            # Dictionary of objects linked to the skeleton and their armature modifier state.
-            # We toggle off any armature modifiers to reduce render time for the depsgraph update later.
-            obj_skeleton: dict[str, tuple[str, bool]] = {}
-            for obj in visible_mesh:
-                arm_modifiers: list[Modifier] = [modifier for modifier in obj.modifiers if modifier.type == "ARMATURE"]
-                for modifier in arm_modifiers:
-                    if modifier.object == self.armature_obj: 
-                        obj_skeleton[obj.name] = modifier.name, modifier.show_viewport
-                        modifier.show_viewport = False
-
-
-            # We need to update Blender"s depsgraph per bone level or else child bones will not be given the proper local space rotation
-            bone_levels = self.get_bone_hierarchy_levels()
-            for level in range(max(bone_levels.keys())):
-                level_bones = bone_levels[level]
-                for bone in level_bones:
-                    self.convert_rotation_space(pose["Bones"], bone)
-
-                self.armature_obj.update_tag(refresh={"DATA"})
-                context.evaluated_depsgraph_get().update()
-            
-            for obj_name, (modifer, modifier_state) in obj_skeleton.items():
-                bpy.data.objects[obj_name].modifiers[modifer].show_viewport = modifier_state
-    
-    def convert_rotation_space(self, source_bone_rotations: dict[str, str], bone: PoseBone) -> None:
-        bone_name = bone.name
-        if bone_name not in source_bone_rotations:
-            if bone_name not in self.old_bone_map:
-                return
-            if self.old_bone_map[bone_name] not in source_bone_rotations:
-                return
-            bone_name = self.old_bone_map[bone.name]
-            
-        # Get rotation data for current bone
-        rotation_str = source_bone_rotations[bone_name]["Rotation"]
-        rotation = rotation_str.split(", ")
-        # XYZW to WXYZ
-        rotation = Quaternion((float(rotation[3]), float(rotation[0]), float(rotation[1]), float(rotation[2])))
-        
-        if self.is_rotated:
-            final_matrix        = rotation.to_matrix().to_4x4()
-        else:
-            # Adjust global space of quaternion
-            corrected_rotation  = Quaternion((1, 0, 0), pi / 2) @ rotation
-            final_matrix        = corrected_rotation.to_matrix().to_4x4()
-        
-        # Gives us local space rotation for the bone
-        bone_rotation = self.armature_obj.convert_space(
-            pose_bone=bone,
-            matrix=final_matrix,
-            from_space="POSE",
-            to_space="LOCAL"
-        )
-        
-        bone.rotation_mode = "QUATERNION"
-        bone.rotation_quaternion = bone_rotation.to_quaternion()
+            targets: dict[str, Matrix] = {}
+            for bone in self.armature_obj.pose.bones:
+                bone_name = pose_bone_name(bone.name, pose["Bones"])
+                if bone_name:
+                    targets[bone.name] = pose_rotation(pose["Bones"][bone_name]["Rotation"], self.is_rotated)
 
-    def get_bone_hierarchy_levels(self) -> dict[int, list]:
-        bone_levels: dict[int, list] = {}
-        
-        def calculate_bone_level(bone: PoseBone, level: int):
-            bone_levels.setdefault(level, [])
-            bone_levels[level].append(bone)
-            for child in bone.children:
-                calculate_bone_level(child, level + 1)
-        
-        for bone in self.armature_obj.pose.bones:
-            if not bone.parent:
-                calculate_bone_level(bone, 0)
-        
-        return bone_levels
+            # All bones are set in one pass, the armature and its meshes are only evaluated once.
+            pose_bones = self.armature_obj.pose.bones
+            for bone_name, rotation in local_rotations(self.armature_obj, targets).items():
+                pose_bones[bone_name].rotation_mode       = "QUATERNION"
+                pose_bones[bone_name].rotation_quaternion = rotation
 
+            context.evaluated_depsgraph_get().update()
+    
     def scale_bones(self, source_bone_scaling: dict[str, str], bone: PoseBone):
-        bone_name = bone.name
-        if bone_name not in source_bone_scaling:
-            if bone_name not in self.old_bone_map:
-                return
-            if self.old_bone_map[bone_name] not in source_bone_scaling:
-                return
-            bone_name = self.old_bone_map[bone.name]
+        bone_name = pose_bone_name(bone.name, source_bone_scaling)
+        if not bone_name:
+            return
             
         # Get scaling data for current bone
         try:
@@ -330,7 +365,74 @@ class PoseApply(Operator):
             bone.scale[1] = float(scaling_dict["Y"])
             bone.scale[2] = float(scaling_dict["Z"])     
     
+class PoseBake(Operator):
+    bl_idname = "ya.pose_bake"
+    bl_label = "Bake Poses"
+    bl_description = "Select a folder of .pose files and bake them into an animation, one pose per frame step"
+    bl_options = {"UNDO"}
+
+    directory:   StringProperty(subtype="DIR_PATH", options={"HIDDEN"}) # type: ignore
+    filter_glob: StringProperty(
+        default="*.pose",
+        options={"HIDDEN"}) # type: ignore
+    
+    frame_step:  IntProperty(name="Frame Step", default=10, min=1, description="Frames between each pose") # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return get_studio_props().outfit_armature
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+    
+    def execute(self, context):
+        props        = get_studio_props()
+        armature_obj = props.outfit_armature
+        pose_files   = sorted(Path(self.directory).glob("*.pose"), key=lambda file: file.name.lower())
+        if not pose_files:
+            self.report({"ERROR"}, "No pose files in the selected folder.")
+            return {"CANCELLED"}
+
+        with ThreadPoolExecutor() as executor:
+            poses = list(executor.map(read_pose_rotations, pose_files))
+        
+        is_rotated = armature_obj.rotation_euler[0] != 0.0
+        bone_names = {bone.name: (bone.name, OLD_BONE_MAP.get(bone.name)) for bone in armature_obj.pose.bones}
+        bone_keys: dict[str, list[tuple[int, Quaternion]]] = {}
+        
+        invalid = 0
+        frame   = 0
+        for rotations in poses:
+            if rotations is None:
+                invalid += 1
+                continue
+
+            targets: dict[str, Matrix] = {}
+            for bone_name, (new_name, old_name) in bone_names.items():
+                pose_name = new_name if new_name in rotations else old_name
+                if pose_name in rotations:
+                    targets[bone_name] = pose_rotation(rotations[pose_name], is_rotated)
+
+            for bone_name, rotation in local_rotations(armature_obj, targets).items():
+                bone_keys.setdefault(bone_name, []).append((frame, rotation))
+            frame += self.frame_step
+
+        if not bone_keys:
+            self.report({"ERROR"}, "No valid pose files in the selected folder.")
+            return {"CANCELLED"}
+
+        action = bake_rotations(armature_obj, bone_keys, Path(self.directory).name or "Poses")
+        props.actions = action.name
+
+        if invalid:
+            self.report({"WARNING"}, f"Baked {len(pose_files) - invalid} poses, skipped {invalid} invalid files.")
+        else:
+            self.report({"INFO"}, f"Baked {len(pose_files)} poses to {action.name}.")
+        return {"FINISHED"}
+    
 
 CLASSES = [
-    PoseApply
+    PoseApply,
+    PoseBake
 ]
\ No newline at end of file
@@ -417,7 +417,7 @@ class YASManager(Operator):
         try:
             if self.mode == "RESTORE":
                 for obj in targets:
-                    if not obj or not obj.yas.v_groups:
+                    if not obj or not obj.yas.has_weights():
                         continue
                     if len(obj.data.vertices) != obj.yas.old_count:
                         self.report({'ERROR'}, f"{obj.name}'s vertex count has changed, not possible to restore.")
@@ -426,7 +426,7 @@ class YASManager(Operator):
                     if self.store:
                         restore_yas_groups(obj)
                     else:
-                        obj.yas.v_groups.clear()
+                        obj.yas.clear_weights()
                     
                     obj.yas.all_groups = False
                     obj.yas.genitalia  = False
@@ -446,7 +446,7 @@ class YASManager(Operator):
                         return {'CANCELLED'}
                     
                     remove_vertex_groups(obj, skeleton, prefix, self.store)
-                    if obj.yas.v_groups:
+                    if obj.yas.has_weights():
                         obj.yas.old_count = len(obj.data.vertices)
                         if self.mode == "ALL":
                             obj.yas.all_groups = True
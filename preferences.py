@@ -4,7 +4,7 @@ import rna_keymap_ui
 
 from typing         import TYPE_CHECKING
 from bpy.types      import AddonPreferences, PropertyGroup, Context, UILayout, KeyMap, KeyMapItem
-from bpy.props      import StringProperty, BoolProperty, CollectionProperty, EnumProperty, PointerProperty
+from bpy.props      import StringProperty, BoolProperty, CollectionProperty, EnumProperty, PointerProperty, IntProperty
      
 from .ui.draw       import aligned_row, get_conditional_icon, operator_button
 
@@ -139,10 +139,19 @@ class ExportPrefs(PropertyGroup):
         default="Select an export directory...",
         maxlen=255,
         )  # type: ignore
+    
+    batch_workers: IntProperty(
+        name="Workers",
+        description="Background Blender processes used for batch exports. 0 uses your physical core count minus one, 1 exports in the current session",
+        default=0,
+        min=0,
+        max=64,
+        ) # type: ignore
 
     if TYPE_CHECKING:
         display_dir        : str
         output_dir         : str
+        batch_workers      : int
 
 class YetAnotherPreference(AddonPreferences):
     bl_idname = __package__
@@ -203,6 +212,29 @@ class YetAnotherPreference(AddonPreferences):
         maxlen=255,
         )  # type: ignore
     
+    modpack_compression: IntProperty(
+        name="Compression",
+        description="Deflate level used for modpack archives. 0 stores files uncompressed, files that don't compress are always stored",
+        default=6,
+        min=0,
+        max=9,
+        ) # type: ignore
+    
+    modpack_backups: IntProperty(
+        name="Backups",
+        description="Number of backups kept when updating a modpack",
+        default=5,
+        min=1,
+        max=100,
+        ) # type: ignore
+    
+    modpack_backup_size: IntProperty(
+        name="Backup Size",
+        description="Total size in MB the backups may take up, older backups are removed first. The latest backup is always kept. 0 for no limit",
+        default=0,
+        min=0,
+        ) # type: ignore
+    
     auto_cleanup: BoolProperty(
         name="Auto Cleanup",
         description="Cleans up imported files automatically with your current settings",
@@ -232,6 +264,12 @@ class YetAnotherPreference(AddonPreferences):
         description="Controls whether armatures are hidden during animation playback",
         default=True,
         ) # type: ignore
+    
+    profile_startup: BoolProperty(
+        name="Profile Startup",
+        description="Prints the import time of each add-on module to the console when the add-on is registered",
+        default=False,
+        ) # type: ignore
 
     if TYPE_CHECKING:
         modpack_presets: list[ModpackOptionPreset]
@@ -240,11 +278,15 @@ class YetAnotherPreference(AddonPreferences):
 
         modpack_output_display_dir: str
         modpack_output_dir        : str
+        modpack_compression       : int
+        modpack_backups           : int
+        modpack_backup_size       : int
 
         auto_cleanup   : bool
         remove_nonmesh : bool
         update_material: bool
         reorder_meshid : bool
+        profile_startup: bool
 
     def draw(self, context: Context):
         layout       = self.layout
@@ -281,6 +323,9 @@ class YetAnotherPreference(AddonPreferences):
         row.operator("ya.dir_selector", text="", icon="FILE_FOLDER").category = "export"
         row = aligned_row(layout, "Modpack:", "modpack_output_dir", self)
         row.operator("ya.modpack_dir_selector", text="", icon="FILE_FOLDER").category = "OUTPUT_PMP"
+        aligned_row(layout, "Compression:", "modpack_compression", self)
+        aligned_row(layout, "Backups:", "modpack_backups", self)
+        aligned_row(layout, "Backup Size:", "modpack_backup_size", self)
 
         layout.separator(type="SPACE")
     
@@ -329,10 +374,13 @@ class YetAnotherPreference(AddonPreferences):
         row.label(text="Options:")
         options = [
             (self, "armature_vis_anim", self.armature_vis_anim, "Hide Armature", "Controls whether armatures are hidden during animation playback."),
+            (self, "profile_startup", self.profile_startup, "Profile Startup", "Prints the import time of each add-on module to the console when the add-on is registered."),
         ]
 
         self.option_rows(layout.column(align=True), options)
 
+        aligned_row(layout, "Batch Workers:", "batch_workers", self.export)
+
         options = [
             (self, "auto_cleanup", self.auto_cleanup, "Auto Cleanup", "Cleans up imported files automatically with your current settings"),
             (self, "remove_nonmesh", self.remove_nonmesh, "Remove Non-Mesh", "Removes non-mesh objects. Typically leftover objects from FBX imports or skeletons."),
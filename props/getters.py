@@ -29,44 +29,56 @@ def get_devkit_props() -> 'DevkitProps' | Literal[False]:
 def get_devkit_win_props() -> 'DevkitWindowProps' | Literal[False]:
     return getattr(bpy.context.window_manager, "ya_devkit_window", False)
 
-def get_xiv_meshes(objs: list[Object]) -> list[list[tuple[Object, int, str, list[str]]]] :
+def get_mesh_id(obj: Object) -> tuple[int | None, int | None, int, str | None]:
+    name_parts = obj.name.strip().split(" ")
+    lod_level  = 0
+    if re.search(r"^\d+.\d+\s", obj.name):
+        mesh_id   = name_parts[0]
+        name      = name_parts[1:]
+        lod_level = int(obj.name[-1]) if obj.name[-4:-1] == "LOD" else 0
+    elif re.search(r"\s\d+.\d+$", obj.name):
+        mesh_id = name_parts[-1]
+
+        if name_parts[-2] == "Part":
+            name_parts.pop()
+        name = name_parts[:-1]
+    else:
+        return None, None, None, None
     
-    def get_mesh_id(obj: Object) -> tuple[int | None, int | None, int, str | None]:
-        name_parts = obj.name.strip().split(" ")
-        lod_level  = 0
-        if re.search(r"^\d+.\d+\s", obj.name):
-            mesh_id   = name_parts[0]
-            name      = name_parts[1:]
-            lod_level = int(obj.name[-1]) if obj.name[-4:-1] == "LOD" else 0
-        elif re.search(r"\s\d+.\d+$", obj.name):
-            mesh_id = name_parts[-1]
-
-            if name_parts[-2] == "Part":
-                name_parts.pop()
-            name = name_parts[:-1]
-        else:
-            return None, None, None, None
-        
-        mesh       = int(mesh_id.split(".")[0])
-        submesh    = int(mesh_id.split(".")[1])
-        clean_name = " ".join(name)  
-        return mesh, submesh, lod_level, clean_name
+    mesh       = int(mesh_id.split(".")[0])
+    submesh    = int(mesh_id.split(".")[1])
+    clean_name = " ".join(name)  
+    return mesh, submesh, lod_level, clean_name
 
-    mesh_dict: dict[int, list[tuple[Object, int, str, list[str]]]] = defaultdict(list)
-    for obj in objs:
-        mesh, submesh, lod, name = get_mesh_id(obj)
-        if mesh is None or submesh is None:  
-            continue
-        elif lod > 2:
-            continue
+def get_mesh_entry(obj: Object) -> tuple[int, tuple[int, int, str, list[str]]] | None:
+    """Returns the mesh index and the submesh, LOD, name and attributes of an XIV mesh object."""
+    mesh, submesh, lod, name = get_mesh_id(obj)
+    if mesh is None or submesh is None:  
+        return None
+    elif lod > 2:
+        return None
 
-        obj_props = [key for key, value in obj.items() if key.startswith(XIV_ATTR) and value]
-        mesh_dict[mesh].append((obj, submesh, lod, name, obj_props))
+    obj_props = [key for key, value in obj.items() if key.startswith(XIV_ATTR) and value]
+    return mesh, (submesh, lod, name, obj_props)
 
+def sort_xiv_meshes(mesh_dict: dict[int, list[tuple[Object, int, int, str, list[str]]]]) -> list[list[tuple[Object, int, int, str, list[str]]]]:
     mesh_indices = sorted(mesh_dict.keys())
-    sorted_meshes: list[list[tuple[Object, int, str, list[str]]]] = []
+    sorted_meshes: list[list[tuple[Object, int, int, str, list[str]]]] = []
     for mesh_idx in mesh_indices:
         submeshes = sorted(mesh_dict[mesh_idx], key=lambda x: (x[2], x[1]))
         sorted_meshes.append(submeshes)
     
     return sorted_meshes
+
+def get_xiv_meshes(objs: list[Object]) -> list[list[tuple[Object, int, str, list[str]]]] :
+    """Parses the given objects, the visible scene meshes are cached by get_scene_meshes."""
+    mesh_dict: dict[int, list[tuple[Object, int, str, list[str]]]] = defaultdict(list)
+    for obj in objs:
+        entry = get_mesh_entry(obj)
+        if entry is None:
+            continue
+
+        mesh, obj_data = entry
+        mesh_dict[mesh].append((obj, *obj_data))
+
+    return sort_xiv_meshes(mesh_dict)
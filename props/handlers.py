@@ -3,6 +3,8 @@ import bpy
 from .getters         import get_window_props, get_devkit_props, get_studio_props, get_devkit_win_props
 from bpy.types        import Object, Context
 from bpy.app.handlers import persistent
+from .window          import invalidate_enum_items
+from .scene_index     import SCENE_INDEX
 from ..preferences    import get_prefs
 
 
@@ -43,6 +45,24 @@ def active_obj_msgbus(dummy):
         notify=get_mesh_props,
         )
 
+@persistent
+def depsgraph_update(scene, depsgraph) -> None:
+    SCENE_INDEX.update(depsgraph)
+    invalidate_enum_items()
+
+@persistent
+def reset_caches(dummy) -> None:
+    # Undo and file loads invalidate every cached object reference.
+    SCENE_INDEX.clear()
+    invalidate_enum_items()
+
+@persistent
+def migrate_yas_weights(dummy) -> None:
+    from ..mesh.weights import migrate_stored_weights
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH' and obj.yas.v_groups:
+            migrate_stored_weights(obj)
+
 def viewport_armature(context: Context, visibility: bool) -> None:
     context = bpy.context
     area = [area for area in context.screen.areas if area.type == 'VIEW_3D'][0]
@@ -94,11 +114,21 @@ def set_handlers() -> None:
     dummy = None
     active_obj_msgbus(dummy)
     bpy.app.handlers.load_post.append(active_obj_msgbus)
+    bpy.app.handlers.load_post.append(migrate_yas_weights)
+    bpy.app.handlers.load_post.append(reset_caches)
+    bpy.app.handlers.undo_post.append(reset_caches)
+    bpy.app.handlers.redo_post.append(reset_caches)
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update)
     bpy.app.handlers.animation_playback_pre.append(pre_anim_handling)
     bpy.app.handlers.animation_playback_post.append(post_anim_handling)
 
 def remove_handlers() -> None:
     bpy.msgbus.clear_by_owner(_active_obj)
     bpy.app.handlers.load_post.remove(active_obj_msgbus)
+    bpy.app.handlers.load_post.remove(migrate_yas_weights)
+    bpy.app.handlers.load_post.remove(reset_caches)
+    bpy.app.handlers.undo_post.remove(reset_caches)
+    bpy.app.handlers.redo_post.remove(reset_caches)
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update)
     bpy.app.handlers.animation_playback_pre.remove(pre_anim_handling)
     bpy.app.handlers.animation_playback_post.remove(post_anim_handling)
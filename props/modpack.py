@@ -1,4 +1,8 @@
-from typing          import TYPE_CHECKING, Literal
+import json
+import zipfile
+
+from copy            import deepcopy
+from typing          import TYPE_CHECKING, Literal, Iterator
 from pathlib         import Path
 from itertools       import chain
 from bpy.types       import PropertyGroup, Context
@@ -10,6 +14,81 @@ from ..xivpy.pmp     import Modpack
 from ..utils.typings import BlendEnum, BlendCollection
 
 
+class ModpackMetadata:
+    """
+    Metadata of one version of a modpack archive.
+    Only the central directory, meta.json and the group JSON are read, each group is parsed on first access.
+    The full Modpack is only built when asked for, group indices are translated to its order with modpack_index.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        with zipfile.ZipFile(file_path, "r") as archive:
+            names       = archive.namelist()
+            group_files = sorted(name for name in names if "/" not in name and name.startswith("group_") and name.endswith(".json"))
+
+            self.members: dict[str, str] = {name.lower(): name for name in names}
+            self.meta   : dict           = json.loads(archive.read("meta.json").decode("utf-8-sig")) if "meta.json" in names else {}
+            self._raw   : list[bytes]    = [archive.read(name) for name in group_files]
+
+        self._groups : list[dict | None] = [None] * len(self._raw)
+        self._modpack: Modpack | None    = None
+        self._order  : list[int]         = []
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def group(self, idx: int) -> dict:
+        if self._groups[idx] is None:
+            self._groups[idx] = json.loads(self._raw[idx].decode("utf-8-sig"))
+        return self._groups[idx]
+    
+    def groups(self) -> Iterator[dict]:
+        for idx in range(len(self)):
+            yield self.group(idx)
+
+    def modpack(self) -> Modpack:
+        """Returns a copy, callers are free to modify it."""
+        if self._modpack is None:
+            self._modpack = Modpack.from_archive(self.file_path)
+            self._order   = self._record_order(self._modpack)
+        return deepcopy(self._modpack)
+    
+    def modpack_index(self, idx: int) -> int:
+        """Index in modpack() of the group at idx in this metadata. Expects the Modpack to be built."""
+        return self._order[idx] if idx < len(self._order) else idx
+
+    def _record_order(self, modpack: Modpack) -> list[int]:
+        """Matches groups by name in file order, duplicate names pair up in the order they appear."""
+        positions: dict[str, list[int]] = {}
+        for idx, group in enumerate(modpack.groups):
+            positions.setdefault(group.Name, []).append(idx)
+
+        order = []
+        for idx, group in enumerate(self.groups()):
+            matches = positions.get(group.get("Name"))
+            order.append(matches.pop(0) if matches else idx)
+
+        return order
+
+_metadata: dict[str, tuple[tuple[int, int], ModpackMetadata]] = {}
+
+def get_modpack_metadata(file_path: Path) -> ModpackMetadata | None:
+    """Cached per path, size and modification time, so rewritten archives are read again."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    
+    if not file_path.is_file():
+        return None
+    
+    key     = str(file_path)
+    version = (stat.st_size, stat.st_mtime_ns)
+    if key not in _metadata or _metadata[key][0] != version:
+        _metadata[key] = (version, ModpackMetadata(file_path))
+
+    return _metadata[key][1]
 
 def modpack_data() -> None:
     window = get_window_props()
@@ -17,25 +96,23 @@ def modpack_data() -> None:
     props.loaded_pmp_groups.clear()
 
     blender_groups = window.file.modpack.pmp_mod_groups
-    modpack_path = Path(window.file.modpack.modpack_dir)
-
-    if modpack_path.is_file():
-        modpack = Modpack.from_archive(modpack_path)
-    else:
+    metadata       = get_modpack_metadata(Path(window.file.modpack.modpack_dir))
+    if metadata is None:
         return
 
-    for idx, group in enumerate(modpack.groups):
+    # Indices are in group file order, the packager translates them with modpack_index.
+    for idx, group in enumerate(metadata.groups()):
         new_option = props.loaded_pmp_groups.add()
         new_option.group_value       = str(idx)
-        new_option.group_name        = group.Name
-        new_option.group_description = group.Description
-        new_option.group_page        = group.Page
-        new_option.group_priority    = group.Priority
+        new_option.group_name        = group.get("Name") or ""
+        new_option.group_description = group.get("Description") or ""
+        new_option.group_page        = group.get("Page") or 0
+        new_option.group_priority    = group.get("Priority") or 0
 
-    window.file.modpack.modpack_author  = modpack.meta.Author
-    window.file.modpack.modpack_version = modpack.meta.Version
+    window.file.modpack.modpack_author  = metadata.meta.get("Author") or ""
+    window.file.modpack.modpack_version = metadata.meta.get("Version") or ""
 
-    name_to_idx = {group.Name: str(idx) for idx, group in enumerate(modpack.groups)}
+    name_to_idx = {group.get("Name"): str(idx) for idx, group in enumerate(metadata.groups())}
     for blend_group in blender_groups:
         try:
             blend_group.idx = name_to_idx[blend_group.name]
@@ -0,0 +1,64 @@
+from bpy.types      import Object, Depsgraph
+from collections    import defaultdict
+
+from .getters       import get_mesh_entry, sort_xiv_meshes
+from ..mesh.objects import visible_meshobj
+
+
+class SceneIndex:
+    """
+    Caches the parsed XIV meshes of the visible objects, the Studio overview redraws far more often than the scene changes.
+    Objects are only parsed again after a depsgraph update on them, a rename, or an invalidate from an operator.
+    The sorted meshes hold object references, they're dropped on any depsgraph update, undo or file load.
+    """
+
+    def __init__(self):
+        self.entries: dict[int, tuple[str, tuple | None]] = {}
+        self.meshes : list[list[tuple[Object, int, int, str, list[str]]]] | None = None
+
+    def get_meshes(self) -> list[list[tuple[Object, int, int, str, list[str]]]]:
+        if self.meshes is None:
+            self._rebuild()
+        return self.meshes
+
+    def invalidate(self, obj: Object | None=None) -> None:
+        """Custom property edits don't reach the depsgraph, operators that change them invalidate the object."""
+        if obj is not None:
+            self.entries.pop(obj.as_pointer(), None)
+        self.meshes = None
+
+    def update(self, depsgraph: Depsgraph) -> None:
+        for update in depsgraph.updates:
+            if isinstance(update.id, Object):
+                self.entries.pop(update.id.original.as_pointer(), None)
+        self.meshes = None
+
+    def clear(self) -> None:
+        self.entries = {}
+        self.meshes  = None
+
+    def _rebuild(self) -> None:
+        mesh_dict: dict[int, list[tuple[Object, int, int, str, list[str]]]] = defaultdict(list)
+        entries  : dict[int, tuple[str, tuple | None]] = {}
+        for obj in visible_meshobj():
+            pointer = obj.as_pointer()
+            cached  = self.entries.get(pointer)
+            if cached is None or cached[0] != obj.name:
+                cached = (obj.name, get_mesh_entry(obj))
+            
+            entries[pointer] = cached
+            if cached[1] is None:
+                continue
+
+            mesh, obj_data = cached[1]
+            mesh_dict[mesh].append((obj, *obj_data))
+
+        self.entries = entries
+        self.meshes  = sort_xiv_meshes(mesh_dict)
+
+
+SCENE_INDEX = SceneIndex()
+
+def get_scene_meshes() -> list[list[tuple[Object, int, int, str, list[str]]]]:
+    """Cached get_xiv_meshes(visible_meshobj())."""
+    return SCENE_INDEX.get_meshes()
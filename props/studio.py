@@ -6,11 +6,15 @@ from bpy.types       import PropertyGroup, Object, Context
 from bpy.props       import StringProperty, EnumProperty, CollectionProperty, PointerProperty, BoolProperty, IntProperty, FloatProperty
 
 from .enums          import get_racial_enum
-from .getters        import get_window_props, get_devkit_props, get_xiv_meshes
-from ..mesh.objects  import visible_meshobj
+from .getters        import get_window_props, get_devkit_props
+from .window         import invalidate_enum_items
+from .scene_index    import get_scene_meshes
 from ..utils.typings import BlendEnum, BlendCollection
 
 
+# ID property on YASStorage that holds the packed stored weights.
+STORED_WEIGHTS = "stored_weights"
+
 XIV_MATERIALS = {
                     "gen2/vanilla": "/mt_c0101b0001_a.mtrl",
                     "gen3/tbse"   : "/mt_c0101b0001_b.mtrl",
@@ -28,7 +32,7 @@ class MeshProps(PropertyGroup):
 
     def get_obj_materials(self) -> set[str]:
         obj_materials = set()
-        for obj_data in get_xiv_meshes(visible_meshobj())[self.idx]:
+        for obj_data in get_scene_meshes()[self.idx]:
             obj = obj_data[0]
             if "xiv_material" in obj and obj["xiv_material"].strip():
                 obj_materials.add(obj["xiv_material"])
@@ -96,6 +100,16 @@ class ModelProps(PropertyGroup):
                     description= "For face models. Select a race's neck morph data to use",
                     items=lambda self, context: get_racial_enum()
                     ) # type: ignore
+    tangents  : EnumProperty(
+                    name= "",
+                    default='BLENDER',
+                    description= "Select how vertex tangents are calculated",
+                    items=[
+                        ('BLENDER', "Blender", "Uses Blender's MikkTSpace tangents"),
+                        ('NUMPY', "Fast", "Calculates tangents with numpy alongside the other vertex data. Does not modify the mesh"),
+                        ('VALIDATE', "Validate", "Exports Blender's tangents and reports how much the fast tangents deviate from them"),
+                    ]
+                    ) # type: ignore
     
     shadow_disabled            : BoolProperty(name="Disable Shadows", default=False, description="Disable shadow casting for this model") # type: ignore
     light_shadow_disabled      : BoolProperty(name="Disable Light/Shadow", default=False, description="Unknown") # type: ignore
@@ -135,7 +149,10 @@ class ModelProps(PropertyGroup):
         return flags
     
     if TYPE_CHECKING:
-        meshes: BlendCollection[MeshProps]
+        meshes    : BlendCollection[MeshProps]
+        use_lods  : bool
+        neck_morph: str
+        tangents  : str
 
         shadow_disabled            : bool
         light_shadow_disabled      : bool
@@ -205,6 +222,8 @@ class YASGroup(PropertyGroup):
         vertices  : BlendCollection[YASWeights]
 
 class YASStorage(PropertyGroup):
+    """Stored weights are kept as a packed blob under STORED_WEIGHTS, files from older versions still use v_groups."""
+
     old_count : IntProperty(description="The vertex count of the mesh at the time of storage") # type: ignore
 
     all_groups: BoolProperty(default=False) # type: ignore
@@ -219,6 +238,14 @@ class YASStorage(PropertyGroup):
         genitalia : bool
         physics   : bool
         v_groups  : BlendCollection[YASGroup]
+
+    def has_weights(self) -> bool:
+        return STORED_WEIGHTS in self or bool(self.v_groups)
+    
+    def clear_weights(self) -> None:
+        if STORED_WEIGHTS in self:
+            del self[STORED_WEIGHTS]
+        self.v_groups.clear()
         
 class ShapeModifiers(PropertyGroup):
     name: StringProperty() # type: ignore
@@ -548,11 +575,13 @@ class YAStudioProps(PropertyGroup):
                                     "MOD_MESHDEFORM" if "DEFORM" in modifier.type else \
                                     f"MOD_{modifier.type}"
             
+            invalidate_enum_items()
             if self.shape_modifiers_group and window.studio.shape_modifiers == "":
                 window.studio.shape_modifiers = self.shape_modifiers_group[0].name
 
         else:
             self.shape_modifiers_group.clear()
+            invalidate_enum_items()
 
     yas_source: PointerProperty(
         type= Object,
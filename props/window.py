@@ -4,20 +4,43 @@ import platform
 from typing          import TYPE_CHECKING, Literal
 from bpy.types       import PropertyGroup, Object, Context
 from bpy.props       import StringProperty, EnumProperty, CollectionProperty, BoolProperty, IntProperty, PointerProperty
-from collections.abc import Iterable
+from collections.abc import Iterable, Callable
 
 from .getters        import get_studio_props, get_file_props
 from .modpack        import BlendModGroup, modpack_data
 from ..utils.typings import BlendEnum, BlendCollection
 
 
+# Dynamic enum items keyed by (enum, object pointer, item count). 
+# The previous generation is kept alive as well, Blender reads the returned strings after the callback returns.
+_enum_items   : dict[tuple, BlendEnum] = {}
+_enum_previous: dict[tuple, BlendEnum] = {}
+
+def cached_enum_items(key: tuple, build: Callable[[], BlendEnum]) -> BlendEnum:
+    items = _enum_items.get(key)
+    if items is None:
+        items = _enum_items[key] = build()
+    return items
+
+def invalidate_enum_items() -> None:
+    """Called from the depsgraph handler, catches renames that don't change the item count."""
+    global _enum_items, _enum_previous
+    if _enum_items:
+        _enum_previous = _enum_items
+        _enum_items    = {}
+
+
 class StudioWindow(PropertyGroup):
 
     def get_deform_modifiers(self, context: Context) -> BlendEnum:
         modifiers = get_studio_props().shape_modifiers_group
-        if not modifiers:
-            return [("None", "No Valid Modifiers", "")]
-        return [(modifier.name, modifier.name, "", modifier.icon, index) for index, modifier in enumerate(modifiers)]
+
+        def build() -> BlendEnum:
+            if not modifiers:
+                return [("None", "No Valid Modifiers", "")]
+            return [(modifier.name, modifier.name, "", modifier.icon, index) for index, modifier in enumerate(modifiers)]
+        
+        return cached_enum_items(("modifiers", len(modifiers)), build)
  
     shape_modifiers: EnumProperty(
     name= "",
@@ -94,16 +117,21 @@ class StudioWindow(PropertyGroup):
     
     def get_shape_key_enum(self, context:Context, obj:Object, new:bool=False) -> None:
         if obj is not None and obj.data.shape_keys:
-            shape_keys = []
-            if new:
-                shape_keys.extend([("", "NEW:", ""),("None", "New Key", "")])
-            shape_keys.append(("", "BASE:", ""))
-            for index, key in enumerate(obj.data.shape_keys.key_blocks):
-                if key.name.endswith(":"):
-                    shape_keys.append(("", key.name, ""))
-                    continue
-                shape_keys.append((key.name, key.name, ""))
-            return shape_keys
+            key_blocks = obj.data.shape_keys.key_blocks
+
+            def build() -> BlendEnum:
+                shape_keys = []
+                if new:
+                    shape_keys.extend([("", "NEW:", ""),("None", "New Key", "")])
+                shape_keys.append(("", "BASE:", ""))
+                for index, key in enumerate(key_blocks):
+                    if key.name.endswith(":"):
+                        shape_keys.append(("", key.name, ""))
+                        continue
+                    shape_keys.append((key.name, key.name, ""))
+                return shape_keys
+            
+            return cached_enum_items(("shape_keys", obj.as_pointer(), len(key_blocks), new), build)
         else:
             return [("None", "New Key", "")]
 
@@ -131,7 +159,10 @@ class StudioWindow(PropertyGroup):
     
     def get_vertex_groups(self, context:Context, obj:Object) -> BlendEnum:
         if obj and obj.type == "MESH":
-            return [("None", "None", "")] + [(group.name, group.name, "") for group in obj.vertex_groups]
+            return cached_enum_items(
+                ("vertex_groups", obj.as_pointer(), len(obj.vertex_groups)),
+                lambda: [("None", "None", "")] + [(group.name, group.name, "") for group in obj.vertex_groups]
+                )
         else:
             return [("None", "Select a target", "")]
 
@@ -234,9 +265,25 @@ class IOWindow(PropertyGroup):
         
         )  # type: ignore
     
+    quantise_weights: BoolProperty(
+        name="",
+        description="MDL only. Snaps the merged IVCS/YAS weights to the weight grid before writing them, which caps the vertex group writes. Merged weights below half a grid step are dropped",
+        default=False,
+        )  # type: ignore
+    
+    weight_grid: IntProperty(
+        name="",
+        description="Steps between 0 and 1 that quantised weights snap to. The MDL format stores weights as bytes, 255 steps",
+        default=255,
+        min=1,
+        max=65535,
+        )  # type: ignore
+    
     if TYPE_CHECKING:
         export_body_slot: Literal['Chest', 'Legs', 'Hands', 'Feet', 'Chest & Legs']
         remove_yas      : Literal['KEEP', 'NO_GEN', 'REMOVE']
+        quantise_weights: bool
+        weight_grid     : int
 
         rename_import   : str
         export_xiv_path : str
@@ -392,9 +439,12 @@ class YAWindowProps(PropertyGroup):
             ("create",   "backfaces",   True,   "Creates backface meshes on export. Meshes need to be triangulated"),
             ("check",    "tris",        True,   "Verify that the meshes are triangulated"),
             ("keep",     "shapekeys",   True,   "Preserves game ready shape keys"),
+            ("light",    "copies",      False,  "MDL only. Duplicates meshes without the UV maps, colour layers and custom attributes the exporter doesn't use"),
             ("create",   "subfolder",   True,   "Creates a folder in your export directory for your exported body part"),
             ("rue",      "export",      True,   "Controls whether Rue is exported as a standalone body and variant, or only as a variant for Lava/Masc"),
             ("body",     "names",       False,  "Always add body names on exported files or depending on how many bodies you export"),
+            ("shared",   "topology",    False,  "MDL only. Reuses the processed meshes between files that only differ in shape key values"),
+            ("skip",     "unchanged",   False,  "Skips files whose meshes and settings haven't changed since the last batch export. Tracked in a manifest in the export folder"),
             ("chest",    "g_category",  False,  "Changes gamepath category"),
             ("hands",    "g_category",  False,  "Changes gamepath category"),
             ("legs",     "g_category",  False,  "Changes gamepath category"),
@@ -510,9 +560,12 @@ class YAWindowProps(PropertyGroup):
         reorder_mesh_id : bool
         update_material : bool
         keep_shapekeys  : bool
+        light_copies    : bool
         create_subfolder: bool
         rue_export      : bool
         body_names      : bool
+        shared_topology : bool
+        skip_unchanged  : bool
         chest_g_category: bool
         hands_g_category: bool
         legs_g_category : bool
@@ -94,11 +94,20 @@ class FileManager(Panel):
         row.prop(self.window_props, "keep_shapekeys", text="Shape Keys", icon=icon)
         icon = get_conditional_icon((self.window_props.create_backfaces and check_tri_status))
         row.prop(self.window_props, "create_backfaces", text="Backfaces", icon=icon, emboss=check_tri_status)
+        icon = get_conditional_icon((self.window_props.light_copies and is_mdl))
+        row.prop(self.window_props, "light_copies", text="Light Copy", icon=icon, emboss=is_mdl)
 
         layout.separator(type="LINE")
         
         aligned_row(layout, "IVCS/YAS:", "remove_yas", self.window_props.file.io)
 
+        io   = self.window_props.file.io
+        icon = get_conditional_icon(io.quantise_weights and is_mdl)
+        text = "Quantised" if io.quantise_weights else "Exact"
+        row  = aligned_row(layout, "Weights:", "quantise_weights", io, prop_str=text, attr_icon=icon, emboss=is_mdl)
+        if io.quantise_weights and is_mdl:
+            row.prop(io, "weight_grid", text="Grid")
+
         layout.separator(factor=0.1)
 
         if not self.devkit_props:
@@ -285,6 +294,14 @@ class FileManager(Panel):
         text = "Standalone" if self.window_props.rue_export else "Variant"
         aligned_row(col, "Rue Export:", "rue_export", self.window_props, prop_str=text, attr_icon=icon)
 
+        icon = get_conditional_icon(self.window_props.shared_topology)
+        text = "Reuse" if self.window_props.shared_topology else "Rebuild"
+        aligned_row(col, "Meshes:", "shared_topology", self.window_props, prop_str=text, attr_icon=icon)
+
+        icon = get_conditional_icon(self.window_props.skip_unchanged)
+        text = "Skip" if self.window_props.skip_unchanged else "Overwrite"
+        aligned_row(col, "Unchanged:", "skip_unchanged", self.window_props, prop_str=text, attr_icon=icon)
+
         icon = get_conditional_icon(self.window_props.create_subfolder)
         text = "Remove" if self.window_props.create_subfolder else "Keep"
         aligned_row(col, "Subfolder:", "create_subfolder", self.window_props, prop_str=text, attr_icon=icon)
@@ -348,6 +365,7 @@ class FileManager(Panel):
 
         row = aligned_row(layout, "Output:", "modpack_output_display_dir", self.prefs)
         row.operator("ya.modpack_dir_selector", icon="FILE_FOLDER", text="").category = "OUTPUT_PMP" 
+        row.operator("ya.modpack_restore", icon="RECOVER_LAST", text="")
 
         box = layout.box()
         row = box.row(align=True)
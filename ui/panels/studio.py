@@ -5,9 +5,8 @@ from bpy.types       import Panel, UILayout, Context, Object
 from collections     import Counter
          
 from ..draw          import aligned_row, get_conditional_icon, ui_category_buttons, show_ui_button, operator_button
-from ...props        import get_studio_props, get_devkit_props, get_window_props, get_devkit_win_props, get_xiv_meshes
+from ...props        import get_studio_props, get_devkit_props, get_window_props, get_devkit_win_props, get_scene_meshes
 
-from ...mesh.objects import visible_meshobj
 from ...xivpy.model  import XIV_COL, XIV_UV
 
 
@@ -154,7 +153,7 @@ class MeshStudio(Panel):
             return {submesh for submesh, count in counts.items() if count > 1}
         
         columns = ["OBJECT", "PART", "ATTR"]
-        meshes  = get_xiv_meshes(visible_meshobj())
+        meshes  = get_scene_meshes()
         model   = self.outfit_props.model
          
         box         = layout.box()
@@ -286,6 +285,7 @@ class MeshStudio(Panel):
         icon = get_conditional_icon(getattr(self.outfit_props.model, "use_lods"))
         aligned_row(options_box, "LODs:", "use_lods", self.outfit_props.model, prop_str="Export", attr_icon=icon)
         aligned_row(options_box, "Neck Morph:", "neck_morph", self.outfit_props.model)
+        aligned_row(options_box, "Tangents:", "tangents", self.outfit_props.model)
 
         options_box.separator(type="LINE", factor=0.5)
 
@@ -596,7 +596,7 @@ class MeshStudio(Panel):
                 op = details.operator("ya.yas_manager", text="", icon='FILE_TICK')
                 op.mode = self.window_props.studio.yas_storage
                 op.target = 'ACTIVE'
-            if obj.yas.v_groups:
+            if obj.yas.has_weights():
                 op = details.operator("ya.yas_manager", text="", icon='FILE_PARENT')
                 op.mode = 'RESTORE'
                 op.target = 'ACTIVE'         
@@ -616,7 +616,7 @@ class MeshStudio(Panel):
             icon = 'ERROR'
             text = missing_obj
         
-        elif not obj.yas.v_groups:
+        elif not obj.yas.has_weights():
             icon = 'X'
             text = no_weights
         
@@ -679,7 +679,9 @@ class MeshStudio(Panel):
             split = row.split(factor=0.25, align=True)
             split.alignment = "RIGHT"
             split.label(text="Animation:")
-            split.prop(self.outfit_props, "actions", text="", icon="ACTION")
+            actionrow = split.row(align=True)
+            actionrow.prop(self.outfit_props, "actions", text="", icon="ACTION")
+            actionrow.operator("ya.pose_bake", text="", icon="IMPORT")
 
             if self.outfit_props.outfit_armature and self.outfit_props.actions != "None":
                 # box.separator(factor=0.5, type="LINE")
@@ -1,6 +1,8 @@
 import logging
 
-from bpy.types    import PropertyGroup
+from typing          import Any
+from bpy.types       import PropertyGroup
+from collections.abc import Callable
 
 
 class RNAPropertyIO:
@@ -13,13 +15,28 @@ class RNAPropertyIO:
 
     restore: Restores specified PropertyGroup with input data.
 
-    remove: Removes PropertGroup collection at specified index. Restores PropertyGroup without the removed collection.
+    remove: Removes PropertGroup collection at specified index.
+
+    sort: Moves a collection item up or down.
+
+    reorder: Sorts a collection in place.
 
     """
 
+    # Property names and types per RNA type, shared by all instances.
+    _schemas: dict[str, dict[str, str]] = {}
+
     def __init__(self):
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
 
+    def get_schema(self, prop_group: PropertyGroup) -> dict[str, str]:
+        rna_type = prop_group.bl_rna
+        schema   = self._schemas.get(rna_type.identifier)
+        if schema is None:
+            schema = {prop.identifier: prop.type for prop in rna_type.properties if prop.identifier != 'rna_type'}
+            self._schemas[rna_type.identifier] = schema
+        return schema
+
     
     def extract(self, prop_group: PropertyGroup) -> list[dict]:
         if hasattr(prop_group, '__len__') and hasattr(prop_group, '__iter__'):
@@ -40,42 +57,31 @@ class RNAPropertyIO:
             self.restore_property_group(entry, new_item)
     
     def remove(self, prop_group: PropertyGroup, idx_to_remove: int) -> bool:
-        """Remove item at specified index and restores PropertyGroup without it, keeping the original order"""
+        """Remove item at specified index, keeping the original order"""
         if idx_to_remove < 0 or idx_to_remove >= len(prop_group):
             return False
         
-        temp_items = []
-        for index, item in enumerate(prop_group):
-            if index != idx_to_remove:
-                temp_items.append(self.extract_property_group(item))
-        
-        prop_group.clear()
-        for item_data in temp_items:
-            new_item = prop_group.add()
-            self.restore_property_group(item_data, new_item)
-        
+        prop_group.remove(idx_to_remove)
         return True
 
     def sort(self, prop_group: PropertyGroup, current_idx: int, up=True) -> None:
         if (current_idx == 0 and up) or (current_idx == len(prop_group) - 1 and not up):
             return False
-        
-        temp_items = []
-        for item in prop_group:
-            temp_items.append(self.extract_property_group(item))
 
         factor = -1 if up else +1
-
-        temp_copy = temp_items[current_idx + factor]
-        temp_items[current_idx + factor] = temp_items[current_idx]
-        temp_items[current_idx] = temp_copy
-
-        prop_group.clear()
-        for item_data in temp_items:
-            new_item = prop_group.add()
-            self.restore_property_group(item_data, new_item)
-        
+        prop_group.move(current_idx, current_idx + factor)
         return True
+    
+    def reorder(self, prop_group: PropertyGroup, key: Callable[[PropertyGroup], Any]) -> None:
+        """Stable in place sort, items are moved natively instead of being extracted and restored."""
+        keys = [key(item) for item in prop_group]
+        for target_idx in range(len(keys)):
+            source_idx = min(range(target_idx, len(keys)), key=lambda idx: keys[idx])
+            if source_idx == target_idx:
+                continue
+            
+            prop_group.move(source_idx, target_idx)
+            keys.insert(target_idx, keys.pop(source_idx))
 
     def extract_property_group(self, prop_group: PropertyGroup) -> dict:
         if prop_group is None:
@@ -85,14 +91,8 @@ class RNAPropertyIO:
         if not hasattr(prop_group, 'bl_rna') and not hasattr(prop_group.bl_rna, 'properties'):
             return None
         
-        result     = {}
-        properties = prop_group.bl_rna.properties
-        for prop_name in properties.keys():
-            if prop_name == 'rna_type':
-                continue
-            
-            prop_def = properties[prop_name]
-            prop_type = prop_def.type
+        result = {}
+        for prop_name, prop_type in self.get_schema(prop_group).items():
             try:
                 value = getattr(prop_group, prop_name)
 
@@ -117,16 +117,13 @@ class RNAPropertyIO:
         if data is None:
             return
         
+        schema = self.get_schema(prop_group)
         for prop_name, value in data.items():
-            if not hasattr(prop_group, prop_name):
+            prop_type = schema.get(prop_name)
+            if prop_type is None:
                 continue
                 
             try:
-                prop_def = prop_group.bl_rna.properties.get(prop_name)
-                if prop_def is None:
-                    continue
-                    
-                prop_type = prop_def.type
                 if prop_type == "COLLECTION":
                     self.handle_collection(prop_group, prop_name, value)
 